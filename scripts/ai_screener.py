@@ -4,62 +4,75 @@ AI 스크리닝 — Scopus/DB export CSV를 읽어서 관련 논문만 필터링
 
 사용법:
   python3 ai_screener.py ~/ResearchOS/00_search_design/scopus_exports/export.csv
-  python3 ai_screener.py export.csv --write     # 결과 저장
+  python3 ai_screener.py export.csv --write     # 마크다운 보고서 + 결과 JSON 저장
+  python3 ai_screener.py export.csv --restart   # 저널을 비우고 처음부터
+  python3 ai_screener.py export.csv --write --batch [--wait]   # 배치 API로 제출 (끝난 뒤 다시 실행)
+  python3 ai_screener.py export.csv --write --scorer tfidf      # LLM 없이 TF-IDF 코사인으로 분류 (5000편 단위)
+  python3 ai_screener.py export.csv --write --scorer embedding  # 로컬 임베딩 (sentence-transformers)
+  python3 ai_screener.py export.csv --jobs 4    # 룰베이스(LLM 미설치) 스크리닝 프로세스 수 (기본: CPU 코어 수)
+  python3 ai_screener.py export.csv --write --token-budget 12000 --concurrency 8   # LLM 요청당 입력 토큰 / 동시 요청 수
+  python3 ai_screener.py export.csv --no-dedup  # 중복 제거 없이 CSV 전체를 스크리닝
+
+결과는 배치마다 logs/.state/screening/ 저널(JSONL)에 바로 기록된다. 중단되면 같은 명령을
+다시 실행해 이어서 하고 (이미 끝난 행은 CSV 행 내용 해시로 건너뜀), 보고서와 결과 JSON은 저널에서 만든다.
+
+스크리닝 전에 이전 export에서 본 논문, 같은 CSV 안의 중복, Zotero library.json에 이미 있는
+논문을 DOI / 제목 지문으로 걸러낸다 (dedup_index.py). 지문은 --write 실행에서만 저장된다.
+
+LLM 스크리닝은 프롬프트 하나에 입력 토큰 예산(SCREEN_TOKEN_BUDGET, 기본 8000)이 찰 때까지
+논문을 채워 보낸다 (응답 길이 때문에 요청당 최대 SCREEN_MAX_PAPERS편). 응답에서 빠지거나
+깨진 논문만 다시 요청하고, 속도 제한은 llm_client의 RPM 제한(LLM_RPM)이 맡는다.
 """
 
 import csv
+import hashlib
 import json
 import os
 import sys
 import re
+import shutil
+import tempfile
 import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 
+from dedup_index import FingerprintIndex
+from keyword_matcher import KeywordMatcher
+from llm_batch import prepare_batch
+from llm_client import (LLM_PROVIDER, MAX_TOKENS, call_llm, estimate_tokens, llm_sdk_available,
+                        print_llm_stats)
+from llm_pool import default_concurrency, ordered_map
+from relevance_engine import HAS_EMBEDDINGS, SCORERS, DocumentFrequency, batch_scores
+
 load_dotenv(Path.home() / "ResearchOS" / "secrets" / ".env")
 
 RESEARCH_PROFILE = Path.home() / "ResearchOS" / "MY_RESEARCH.md"
 OUTPUT_DIR = Path.home() / "ResearchOS" / "00_search_design"
-LLM_PROVIDER = os.getenv("LLM_PROVIDER", "claude").lower()
+JOURNAL_DIR = Path.home() / "ResearchOS" / "logs" / ".state" / "screening"
 DEFAULT_KEYWORDS = [
     "anxiety", "depression", "mood", "mental health",
     "art therapy", "creative", "meaning", "purpose",
     "identity", "automation", "artificial intelligence",
 ]
-
-def call_llm(prompt, system_prompt):
-    if LLM_PROVIDER == "claude":
-        from anthropic import Anthropic
-        client = Anthropic()
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514", max_tokens=2000,
-            system=system_prompt,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return response.content[0].text
-    else:
-        from openai import OpenAI
-        client = OpenAI()
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role":"system","content":system_prompt},{"role":"user","content":prompt}],
-            temperature=0.2, max_tokens=2000
-        )
-        return response.choices[0].message.content
-
-def llm_sdk_available():
-    if LLM_PROVIDER == "claude":
-        try:
-            import anthropic  # noqa: F401
-            return True
-        except ImportError:
-            return False
-    try:
-        import openai  # noqa: F401
-        return True
-    except ImportError:
-        return False
+# --scorer 코사인 → relevance 등급 (이상). 키워드 묶음과 초록의 코사인은 대체로 0.3 아래다.
+VECTOR_LEVELS = (("high", 0.20), ("medium", 0.10), ("low", 0.03))
+# --scorer는 이만큼씩 묶어 점수화한다. idf는 먼저 CSV 전체를 한 번 훑어 센 문서 빈도 기준이라
+# 점수가 어느 묶음에 들었는지와 무관하고, 메모리는 CSV 크기가 아니라 용어 수만큼 든다.
+SCORER_CHUNK = 5000
+# 룰베이스는 이만큼씩 잘라 프로세스 풀 워커에 나눠 준다
+RULE_CHUNK = 2000
+# LLM 프롬프트 하나의 입력 토큰 예산 (연구 프로필 + 지시문 + 논문들)
+SCREEN_TOKEN_BUDGET = int(os.getenv("SCREEN_TOKEN_BUDGET", "8000"))
+SCREEN_ABSTRACT_CHARS = int(os.getenv("SCREEN_ABSTRACT_CHARS", "1200"))
+# 한 줄 JSON 결과 한 편 ≈ 60토큰. 응답이 MAX_TOKENS에 잘리지 않게 요청당 편수를 묶는다.
+SCREEN_MAX_PAPERS = int(os.getenv("SCREEN_MAX_PAPERS", str(MAX_TOKENS * 9 // 10 // 60)))
+SCREEN_RETRIES = 2
+RELEVANCE_LEVELS = ("high", "medium", "low", "irrelevant")
 
 def extract_profile_keywords(research_profile):
     kws = set(DEFAULT_KEYWORDS)
@@ -72,54 +85,130 @@ def extract_profile_keywords(research_profile):
                     kws.add(token)
     return sorted(kws)
 
+COUNTER_TERMS = ("no effect", "null finding", "not significant", "ineffective", "mixed evidence")
+# 앞에서부터 처음 맞는 섹션
+SECTION_TERMS = (
+    ("예술/정신건강", frozenset(["art", "creative", "music", "therapy"])),
+    ("AI/실존", frozenset(["ai", "automation", "unemployment", "purpose", "meaning"])),
+    ("우울/불안", frozenset(["anxiety", "depression", "cbt", "mindfulness"])),
+)
+_LABEL_TERMS = frozenset(COUNTER_TERMS).union(*(terms for _, terms in SECTION_TERMS))
+_LABEL_MATCHER = KeywordMatcher(sorted(_LABEL_TERMS))
+
+def section_of(found):
+    """content에서 찾은 용어 집합 → Lit Review 섹션"""
+    return next((name for name, terms in SECTION_TERMS if not found.isdisjoint(terms)), "교차점")
+
+def is_counterargument(found):
+    return not found.isdisjoint(COUNTER_TERMS)
+
+class RuleScreener:
+    """프로필 키워드 + 섹션/반론 용어를 KeywordMatcher 하나로 컴파일해 두고
+    논문마다 (제목 + 초록)을 한 번만 훑는다. 결과는 예전 ``kw in content`` 루프와 같다."""
+
+    def __init__(self, research_profile):
+        self.keywords = frozenset(extract_profile_keywords(research_profile))
+        self.matcher = KeywordMatcher(sorted(self.keywords | _LABEL_TERMS))
+
+    def screen(self, papers_batch):
+        findall, keywords = self.matcher.findall, self.keywords
+        results = []
+        for i, p in enumerate(papers_batch, 1):
+            title = p.get("title", "").lower()
+            abstract = p.get("abstract", "").lower()
+            found = findall(f"{title} {abstract}")
+            hits = len(found & keywords)
+
+            if hits >= 6:
+                rel = "high"
+            elif hits >= 3:
+                rel = "medium"
+            elif hits >= 1:
+                rel = "low"
+            else:
+                rel = "irrelevant"
+
+            results.append(
+                {
+                    "index": i,
+                    "relevance": rel,
+                    "reason": f"키워드 매칭 {hits}개 기반 룰베이스 분류",
+                    "section_fit": section_of(found),
+                    "is_counterargument": is_counterargument(found),
+                }
+            )
+        return results
+
+@lru_cache(maxsize=4)
+def rule_screener(research_profile):
+    return RuleScreener(research_profile)
+
 def rule_based_screen(papers_batch, research_profile):
+    return rule_screener(research_profile).screen(papers_batch)
+
+def _rule_screen_chunk(papers_batch, research_profile):
+    # 워커 프로세스: 매처는 프로세스마다 한 번만 컴파일된다 (lru_cache)
+    return rule_based_screen(papers_batch, research_profile)
+
+def rule_screen_batches(batches, research_profile, jobs=None):
+    """(batch, results)를 입력 순서대로 yield. 배치가 둘 이상이면 프로세스 풀에 나눠 맡긴다.
+
+    매칭은 순수 파이썬 정규식 루프라 GIL에 묶이므로 스레드가 아닌 프로세스를 쓴다.
+    동시에 떠 있는 배치는 jobs * 2개까지라 메모리는 CSV 크기와 무관하다.
+    """
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    batches = iter(batches)
+    head = list(islice(batches, 2))
+    if jobs == 1 or len(head) < 2:
+        for batch in chain(head, batches):
+            yield batch, rule_based_screen(batch, research_profile)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for batch in chain(head, batches):
+            pending.append((batch, pool.submit(_rule_screen_chunk, batch, research_profile)))
+            if len(pending) >= jobs * 2:
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+
+def vector_text(p):
+    # 제목은 두 번 넣어 룰베이스의 제목 우선 효과를 흉내낸다
+    return f"{p.get('title', '')}\n{p.get('title', '')}\n{p.get('abstract', '')}"
+
+def csv_document_frequency(csv_path):
+    """tfidf idf 기준: export CSV 전체의 문서 빈도 (중복 제거 전 — 이어하기/이전 export와 무관하게 같다)"""
+    corpus = DocumentFrequency()
+    for p in iter_csv(csv_path):
+        corpus.add(vector_text(p))
+    return corpus
+
+def vector_screen(papers, research_profile, method="tfidf", corpus=None):
+    """논문 묶음을 한 번에 점수화 (relevance_engine) → rule_based_screen과 같은 형식 + score (0~1 코사인)"""
     keywords = extract_profile_keywords(research_profile)
+    scores = batch_scores([vector_text(p) for p in papers], keywords, method, corpus)
     results = []
-    for i, p in enumerate(papers_batch, 1):
-        title = p.get("title", "").lower()
-        abstract = p.get("abstract", "").lower()
-        content = f"{title} {abstract}"
-        hits = sum(1 for kw in keywords if kw in content)
-
-        if hits >= 6:
-            rel = "high"
-        elif hits >= 3:
-            rel = "medium"
-        elif hits >= 1:
-            rel = "low"
-        else:
-            rel = "irrelevant"
-
-        counter_terms = ["no effect", "null finding", "not significant", "ineffective", "mixed evidence"]
-        is_counter = any(t in content for t in counter_terms)
-
-        if any(t in content for t in ["art", "creative", "music", "therapy"]):
-            section = "예술/정신건강"
-        elif any(t in content for t in ["ai", "automation", "unemployment", "purpose", "meaning"]):
-            section = "AI/실존"
-        elif any(t in content for t in ["anxiety", "depression", "cbt", "mindfulness"]):
-            section = "우울/불안"
-        else:
-            section = "교차점"
-
+    for i, (p, score) in enumerate(zip(papers, scores), 1):
+        found = _LABEL_MATCHER.findall(f"{p.get('title', '')} {p.get('abstract', '')}".lower())
+        rel = next((label for label, cut in VECTOR_LEVELS if score >= cut), "irrelevant")
         results.append(
             {
                 "index": i,
                 "relevance": rel,
-                "reason": f"키워드 매칭 {hits}개 기반 룰베이스 분류",
-                "section_fit": section,
-                "is_counterargument": is_counter,
+                "reason": f"{method} 유사도 {score:.2f}",
+                "section_fit": section_of(found),
+                "is_counterargument": is_counterargument(found),
+                "score": round(score, 4),
             }
         )
     return results
 
-def load_csv(csv_path):
-    """Scopus/DB export CSV 읽기"""
-    papers = []
-    
-    with open(csv_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+def iter_csv(csv_path):
+    """Scopus/DB export CSV를 한 행씩 읽는다 (제목 있는 행만)"""
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
             # Scopus 형식: Title, Authors, Abstract, Year, Source title, DOI
             # 다른 DB도 비슷한 필드를 가짐
             paper = {
@@ -131,20 +220,93 @@ def load_csv(csv_path):
                 'doi': row.get('DOI', row.get('doi', row.get('DI', ''))),
             }
             if paper['title']:  # 제목이 있는 것만
-                papers.append(paper)
-    
-    return papers
+                yield paper
 
-def screen_batch(papers_batch, research_profile, use_llm=True):
-    """논문 배치를 AI로 스크리닝"""
-    if not use_llm:
-        return rule_based_screen(papers_batch, research_profile)
-    
-    papers_text = ""
-    for i, p in enumerate(papers_batch):
-        papers_text += f"\n[{i+1}] {p['title']}\n"
-        if p['abstract']:
-            papers_text += f"    Abstract: {p['abstract'][:300]}\n"
+def load_csv(csv_path):
+    """Scopus/DB export CSV 읽기"""
+    return list(iter_csv(csv_path))
+
+def iter_batches(papers, size):
+    papers = iter(papers)
+    while batch := list(islice(papers, size)):
+        yield batch
+
+def row_hash(paper):
+    """CSV 행 내용 해시 — 행 위치가 아니라 내용으로 저널 항목을 찾는다"""
+    raw = "\x1f".join(str(paper.get(k, '')) for k in ('title', 'authors', 'abstract', 'year', 'journal', 'doi'))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+class ScreeningJournal:
+    """스크리닝 결과 저널 (logs/.state/screening/<CSV이름>_<방식>_<id>.jsonl).
+
+    CSV 경로 + 방식(llm/rule/scorer)마다 파일 하나. 배치가 끝날 때마다 (--write가 없어도)
+    relevance를 받은 논문만 한 줄씩 덧붙이고 fsync한다 (재시도 후에도 실패한 논문은 다음 실행에서 다시 돈다). 줄마다 CSV 행 내용 해시(row)가 있어서, 같은 명령을
+    다시 실행하면 저널에 있는 행은 건너뛰고 나머지만 스크리닝한다. CSV에 행이 더해지거나
+    순서가 바뀌어도 새 행만 돈다. 보고서와 집계는 저널에서 만든다.
+    """
+
+    PREFIX = b'{"row": "'
+
+    def __init__(self, csv_path, mode, restart=False):
+        ident = hashlib.sha1(f"{csv_path.resolve()}\x1f{mode}".encode("utf-8")).hexdigest()[:8]
+        self.path = JOURNAL_DIR / f"{csv_path.stem}_{mode}_{ident}.jsonl"
+        self.done = set()
+        self.current = set()
+        offset = self._load() if self.path.exists() and not restart else 0
+        JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "r+b" if offset else "wb")
+        self.file.truncate(offset)  # 중단될 때 반쯤 쓰인 줄은 버린다
+        self.file.seek(offset)
+
+    def _load(self):
+        """완료된 행 해시를 모으고 마지막 온전한 줄 다음 위치를 돌려준다"""
+        offset = 0
+        start = len(self.PREFIX)
+        with open(self.path, "rb") as f:
+            for line in f:
+                # append()가 row를 맨 앞에 쓰므로 줄 전체를 JSON으로 풀 필요가 없다
+                if not line.endswith(b"\n") or not line.startswith(self.PREFIX):
+                    break
+                self.done.add(line[start:start + 16].decode("ascii"))
+                offset += len(line)
+        return offset
+
+    def pending(self, papers):
+        """papers 중 저널에 없는 행만 yield (row 해시를 붙여서)"""
+        for p in papers:
+            h = row_hash(p)
+            self.current.add(h)
+            if h not in self.done:
+                yield {'row': h, **p}
+
+    def append(self, batch):
+        if not batch:
+            return
+        self.file.write("".join(json.dumps(p, ensure_ascii=False) + "\n" for p in batch).encode("utf-8"))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.done.update(p['row'] for p in batch)
+
+    def close(self):
+        self.file.close()
+
+    def records(self):
+        """이번 CSV에 (아직) 있는 행의 결과만, 저널 순서대로"""
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                p = json.loads(line)
+                if p['row'] in self.current:
+                    yield p
+
+def paper_text(i, p, abstract_chars=SCREEN_ABSTRACT_CHARS):
+    text = f"\n[{i}] {p['title']}\n"
+    if p['abstract']:
+        text += f"    Abstract: {p['abstract'][:abstract_chars]}\n"
+    return text
+
+def screening_prompt(papers_batch, research_profile):
+    """screen_batch 프롬프트 → (prompt, system_prompt)"""
+    papers_text = "".join(paper_text(i + 1, p) for i, p in enumerate(papers_batch))
     
     system_prompt = """You are a research screening assistant for a psychology graduate student.
 Evaluate papers for relevance. Respond ONLY with valid JSON. No backticks, no markdown."""
@@ -157,28 +319,171 @@ Evaluate papers for relevance. Respond ONLY with valid JSON. No backticks, no ma
 
 {papers_text}
 
-JSON 형식 (배열):
+JSON 형식 (배열, 논문마다 한 줄짜리 객체, 모든 논문 빠짐없이):
 [
-  {{
-    "index": 1,
-    "relevance": "high/medium/low/irrelevant",
-    "reason": "관련 이유 한 줄 (한국어)",
-    "section_fit": "어느 Lit Review 섹션에 맞는지 (예: AI/실존, 우울/의미, 예술/정신건강, 교차점)",
-    "is_counterargument": false
-  }},
+  {{"index": 1, "relevance": "high/medium/low/irrelevant", "reason": "관련 이유 한 줄 (한국어)", "section_fit": "어느 Lit Review 섹션에 맞는지 (예: AI/실존, 우울/의미, 예술/정신건강, 교차점)", "is_counterargument": false}},
   ...
 ]"""
+    return prompt, system_prompt
+
+def pack_batches(papers, research_profile, budget=SCREEN_TOKEN_BUDGET, max_papers=SCREEN_MAX_PAPERS):
+    """논문 스트림 → 프롬프트 입력 토큰이 budget을 넘지 않게 채운 배치들 (순서 유지).
+
+    프로필/지시문 토큰은 한 번만 재고, 논문마다 제목+초록 토큰을 더해 간다.
+    예산보다 큰 논문 하나는 혼자 한 배치가 된다. 같은 입력이면 항상 같은 배치가 나오므로
+    --batch 제출 때와 결과 회수 때의 프롬프트가 일치한다.
+    """
+    overhead = sum(map(estimate_tokens, screening_prompt([], research_profile)))
+    # [번호] 자릿수 차이는 몇 토큰이라 가장 큰 번호로 잰다
+    batch, used = [], overhead
+    for p in papers:
+        cost = estimate_tokens(paper_text(max_papers, p))
+        if batch and (used + cost > budget or len(batch) >= max_papers):
+            yield batch
+            batch, used = [], overhead
+        batch.append(p)
+        used += cost
+    if batch:
+        yield batch
+
+def parse_results(raw):
+    """LLM 응답 → 결과 dict 목록. 배열이 중간에 잘렸어도(max_tokens) 온전한 객체는 건진다."""
+    cleaned = raw.strip()
+    if cleaned.startswith("```"):
+        cleaned = re.sub(r'^```\w*\n?', '', cleaned)
+        cleaned = re.sub(r'\n?```$', '', cleaned)
+    try:
+        data = json.loads(cleaned)
+        if isinstance(data, dict):
+            data = [data]
+        return [r for r in data if isinstance(r, dict)] if isinstance(data, list) else []
+    except ValueError:
+        pass
+    decoder = json.JSONDecoder()
+    results = []
+    pos = cleaned.find('{')
+    while pos != -1:
+        try:
+            obj, end = decoder.raw_decode(cleaned, pos)
+        except ValueError:
+            pos = cleaned.find('{', pos + 1)
+            continue
+        if isinstance(obj, dict):
+            results.append(obj)
+        pos = cleaned.find('{', end)
+    return results
+
+def parse_screening(raw):
+    results = parse_results(raw)
+    if not results:
+        raise ValueError("스크리닝 응답에서 결과를 찾지 못함")
+    return results
+
+def screen_batch(papers_batch, research_profile, use_llm=True):
+    """논문 배치를 AI로 스크리닝 → 결과 목록 (응답이 깨졌으면 건진 것만, 호출/파싱 실패는 None)"""
+    if not use_llm:
+        return rule_based_screen(papers_batch, research_profile)
 
+    prompt, system_prompt = screening_prompt(papers_batch, research_profile)
     try:
-        raw = call_llm(prompt, system_prompt)
-        cleaned = raw.strip()
-        if cleaned.startswith("```"):
-            cleaned = re.sub(r'^```\w*\n?', '', cleaned)
-            cleaned = re.sub(r'\n?```$', '', cleaned)
-        return json.loads(cleaned)
+        # 하나도 못 건진 응답은 캐시에 남기지 않는다 (남으면 같은 프롬프트를 다시 보내도 계속 실패)
+        return call_llm(prompt, system_prompt, parse=parse_screening)
     except Exception:
         return None
 
+def screen_llm(papers_batch, research_profile, retries=SCREEN_RETRIES):
+    """screen_batch + 실패분 재요청 → (결과 목록, 요청 수).
+
+    응답에서 빠졌거나 index/relevance가 잘못된 논문만 모아 다시 보낸다.
+    응답 전체가 실패하면 배치를 반으로 나눠 보낸다. retries번 뒤에도 남은 논문은 결과에서 빠진다.
+    """
+    results = {}
+    for r in screen_batch(papers_batch, research_profile) or []:
+        idx = r.get('index')
+        if isinstance(idx, int) and 1 <= idx <= len(papers_batch) and r.get('relevance') in RELEVANCE_LEVELS:
+            results.setdefault(idx, r)
+    requests = 1
+    missing = [i for i in range(1, len(papers_batch) + 1) if i not in results]
+    if missing and retries > 0:
+        half = len(missing) // 2
+        parts = [missing[:half], missing[half:]] if not results and half else [missing]
+        for part in parts:
+            sub, n = screen_llm([papers_batch[i - 1] for i in part], research_profile, retries - 1)
+            requests += n
+            for r in sub:
+                idx = part[r['index'] - 1]
+                results[idx] = dict(r, index=idx)
+    return [results[i] for i in sorted(results)], requests
+
+def count_paper(counts, p):
+    counts['total'] += 1
+    counts[p.get('relevance')] += 1
+    if p.get('is_counterargument'):
+        counts['counter'] += 1
+
+def tally(papers):
+    """relevance별 편수 + 반론 + 전체"""
+    counts = Counter()
+    for p in papers:
+        count_paper(counts, p)
+    return counts
+
+def write_report(papers, output_file, csv_path):
+    """결과를 한 번 훑으며 마크다운 보고서를 쓰고 tally를 돌려준다.
+
+    섹션별 본문은 임시 파일에 모았다가 이어 붙이므로 결과를 메모리에 들고 있지 않는다.
+    """
+    counts = Counter()
+    high, medium, counter = (tempfile.TemporaryFile('w+', encoding='utf-8') for _ in range(3))
+    for p in papers:
+        count_paper(counts, p)
+        if p.get('relevance') == 'high':
+            high.write(f"### {p['title']}\n")
+            high.write(f"- **Authors:** {p.get('authors', '?')}\n")
+            high.write(f"- **Year:** {p.get('year', '?')}\n")
+            high.write(f"- **Journal:** {p.get('journal', '?')}\n")
+            if p.get('doi'):
+                high.write(f"- **DOI:** https://doi.org/{p['doi']}\n")
+            high.write(f"- **이유:** {p.get('reason', '')}\n")
+            high.write(f"- **섹션:** {p.get('section_fit', '')}\n")
+            if p.get('is_counterargument'):
+                high.write(f"- ⚔️ **반론 논문**\n")
+            high.write("\n")
+        elif p.get('relevance') == 'medium':
+            medium.write(f"- **{p['title']}** ({p.get('year','?')}) — {p.get('reason','')}\n")
+        if p.get('is_counterargument'):
+            counter.write(f"- **{p['title']}** ({p.get('year','?')}) — {p.get('reason','')}\n")
+
+    with open(output_file, 'w', encoding='utf-8') as out:
+        out.write(f"# 🔍 AI 스크리닝 결과\n")
+        out.write(f"\n> 원본: {csv_path.name}\n")
+        out.write(f"> 총 {counts['total']}편 중 관련 {counts['high'] + counts['medium']}편\n")
+        out.write(f"> 날짜: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
+        for heading, body, tail in (
+            ("## 🟢 High Relevance — Zotero에 추가하세요", high, ""),
+            ("## 🟡 Medium Relevance — 초록 확인 후 판단", medium, "\n"),
+            ("## ⚔️ 반론 논문 — 반드시 포함", counter, ""),
+        ):
+            out.write(f"{heading}\n\n")
+            body.seek(0)
+            shutil.copyfileobj(body, out)
+            body.close()
+            out.write(tail)
+    return counts
+
+def write_results_json(papers, json_file):
+    """결과 JSON 배열 (예전 screening_<시각>.json과 같은 형식, 저널용 row 해시는 뺀다).
+    한 편씩 이어 쓰므로 결과를 메모리에 들고 있지 않는다."""
+    tmp = json_file.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as out:
+        out.write('[')
+        for i, p in enumerate(papers):
+            p = {k: v for k, v in p.items() if k != 'row'}
+            out.write(',\n  ' if i else '\n  ')
+            out.write(json.dumps(p, ensure_ascii=False, indent=2).replace('\n', '\n  '))
+        out.write('\n]\n')
+    tmp.replace(json_file)
+
 def main():
     if len(sys.argv) < 2:
         print("사용법: python3 ai_screener.py export.csv [--write]")
@@ -186,31 +491,104 @@ def main():
     
     csv_path = Path(sys.argv[1]).expanduser()
     write_mode = '--write' in sys.argv
+    batch_mode = '--batch' in sys.argv
+    wait_mode = '--wait' in sys.argv
+    scorer = None
+    if '--scorer' in sys.argv:
+        i = sys.argv.index('--scorer')
+        scorer = sys.argv[i+1] if i+1 < len(sys.argv) else ''
+        if scorer not in SCORERS:
+            print(f"❌ --scorer 값은 {', '.join(SCORERS)} 중 하나여야 합니다.")
+            sys.exit(1)
+        if scorer == 'embedding' and not HAS_EMBEDDINGS:
+            print("⚠️ sentence-transformers 미설치: tfidf로 대체합니다. (pip install sentence-transformers)")
+            scorer = 'tfidf'
+    jobs = None
+    if '--jobs' in sys.argv:
+        i = sys.argv.index('--jobs')
+        try:
+            jobs = max(1, int(sys.argv[i+1]))
+        except (IndexError, ValueError):
+            print("⚠️ --jobs 값이 숫자가 아닙니다. CPU 코어 수만큼 사용합니다.")
+    token_budget = SCREEN_TOKEN_BUDGET
+    if '--token-budget' in sys.argv:
+        i = sys.argv.index('--token-budget')
+        try:
+            token_budget = max(1, int(sys.argv[i+1]))
+        except (IndexError, ValueError):
+            print(f"⚠️ --token-budget 값이 숫자가 아닙니다. 기본값 {token_budget}을 사용합니다.")
+    concurrency = default_concurrency()
+    if '--concurrency' in sys.argv:
+        i = sys.argv.index('--concurrency')
+        try:
+            concurrency = max(1, int(sys.argv[i+1]))
+        except (IndexError, ValueError):
+            print(f"⚠️ --concurrency 값이 숫자가 아닙니다. 기본값 {concurrency}을 사용합니다.")
     
     if not csv_path.exists():
         print(f"❌ 파일을 찾을 수 없습니다: {csv_path}")
         sys.exit(1)
     
-    papers = load_csv(csv_path)
-    print(f"📄 CSV에서 {len(papers)}편 로드")
-    
     research_profile = ""
     if RESEARCH_PROFILE.exists():
         research_profile = RESEARCH_PROFILE.read_text(encoding='utf-8')
 
-    use_llm = llm_sdk_available()
-    if not use_llm:
+    dedup = None if '--no-dedup' in sys.argv else FingerprintIndex()
+    if dedup is not None:
+        owned = dedup.sync_library()
+        if owned:
+            print(f"📚 Zotero 보유 논문 지문 {owned}편 갱신")
+    st = csv_path.stat()
+    csv_sig = f"{st.st_mtime_ns}:{st.st_size}"
+
+    def export_papers():
+        """CSV 논문 스트림 (중복/보유 논문은 점수화·LLM 전에 뺀다)"""
+        papers = iter_csv(csv_path)
+        if dedup is not None:
+            return dedup.filter(papers, str(csv_path.resolve()), csv_sig, record=write_mode)
+        return papers
+
+    use_llm = llm_sdk_available() and scorer is None
+    if scorer:
+        print(f"📐 {scorer} 스코어러로 {SCORER_CHUNK}편씩 분류합니다 (LLM 미사용).")
+    elif not use_llm:
         print(f"⚠️ {LLM_PROVIDER} SDK 미설치: 룰베이스 스크리닝으로 대체합니다.")
+    else:
+        print(f"🤖 요청당 입력 ~{token_budget}토큰 (최대 {SCREEN_MAX_PAPERS}편) | 동시 요청 {concurrency}개")
     
-    # 배치 처리 (10개씩)
-    batch_size = 10
-    all_results = []
+    # 배치 처리 (LLM 토큰 예산만큼, --scorer SCORER_CHUNK개씩, 룰베이스 RULE_CHUNK개씩). CSV는 배치 분량씩만 읽는다.
+    batch_size = SCORER_CHUNK if scorer else RULE_CHUNK
+    mode = scorer or ('llm' if use_llm else 'rule')
+    journal = ScreeningJournal(csv_path, mode, restart='--restart' in sys.argv)
+    if journal.done:
+        print(f"↩️ 이어서 스크리닝: 저널에 있는 {len(journal.done)}편은 건너뜁니다 ({journal.path.name})")
+
+    if use_llm and batch_mode:
+        prompts = (screening_prompt(batch, research_profile)
+                   for batch in pack_batches(journal.pending(export_papers()), research_profile, token_budget))
+        if not prepare_batch(f"screening:{csv_path.resolve()}", prompts, wait=wait_mode):
+            journal.close()
+            return
     
-    for i in range(0, len(papers), batch_size):
-        batch = papers[i:i+batch_size]
-        print(f"\n🤖 스크리닝 중: {i+1}-{min(i+batch_size, len(papers))} / {len(papers)}")
-        
-        results = screen_batch(batch, research_profile, use_llm=use_llm)
+    done = unscreened = 0
+    papers = journal.pending(export_papers())
+    requests = 0
+    started = time.perf_counter()
+    if scorer:
+        corpus = csv_document_frequency(csv_path) if scorer == 'tfidf' else None
+        screened = ((batch, vector_screen(batch, research_profile, scorer, corpus))
+                    for batch in iter_batches(papers, batch_size))
+    elif use_llm:
+        # 배치끼리는 독립이라 동시에 보내고, 결과는 CSV 순서대로 받는다 (RPM은 LLM_CALLER가 지킨다)
+        screened = ordered_map(lambda batch: (batch, screen_llm(batch, research_profile)),
+                               pack_batches(papers, research_profile, token_budget), workers=concurrency)
+    else:
+        screened = rule_screen_batches(iter_batches(papers, batch_size), research_profile, jobs)
+    for batch, results in screened:
+        print(f"\n🤖 스크리닝 중: {done+1}-{done+len(batch)}")
+        if use_llm:
+            results, n = results
+            requests += n
         
         if results:
             for r in results:
@@ -220,76 +598,57 @@ def main():
                     batch[idx]['reason'] = r.get('reason', '')
                     batch[idx]['section_fit'] = r.get('section_fit', '')
                     batch[idx]['is_counterargument'] = r.get('is_counterargument', False)
-            all_results.extend(batch)
-        else:
-            print("  ⚠️  배치 파싱 실패")
-            all_results.extend(batch)
+                    if 'score' in r:
+                        batch[idx]['score'] = r['score']
+        if len(results or ()) < len(batch):
+            print(f"  ⚠️  {len(batch) - len(results or ())}편 파싱 실패 (재시도 후)")
         
-        time.sleep(1)
+        done += len(batch)
+        screened_batch = [p for p in batch if p.get('relevance') in RELEVANCE_LEVELS]
+        unscreened += len(batch) - len(screened_batch)
+        journal.append(screened_batch)
     
-    # 결과 분류
-    high = [p for p in all_results if p.get('relevance') == 'high']
-    medium = [p for p in all_results if p.get('relevance') == 'medium']
-    low = [p for p in all_results if p.get('relevance') == 'low']
-    irrelevant = [p for p in all_results if p.get('relevance') == 'irrelevant']
-    counter = [p for p in all_results if p.get('is_counterargument')]
+    journal.close()
+    if not done:
+        print("✅ 새로 스크리닝할 행이 없습니다. 저널로 결과만 다시 만듭니다. (처음부터: --restart)")
+    if unscreened:
+        print(f"\n⚠️ {unscreened}편은 스크리닝하지 못해 결과에서 빠졌습니다. "
+              f"같은 명령을 다시 실행하면 그 논문만 다시 보냅니다.")
+    if requests:
+        elapsed = time.perf_counter() - started
+        print(f"\n📨 LLM 요청 {requests}회 | 요청당 {done / requests:.1f}편 | "
+              f"분당 {done / elapsed * 60:.0f}편")
+    print_llm_stats()
+    if dedup is not None:
+        if dedup.summary():
+            print(dedup.summary())
+        dedup.close(commit=write_mode)
+
+    if write_mode:
+        output_file = OUTPUT_DIR / f"screening_{datetime.now().strftime('%Y%m%d_%H%M')}.md"
+        json_file = output_file.with_suffix('.json')
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        counts = write_report(journal.records(), output_file, csv_path)
+        write_results_json(journal.records(), json_file)
+    else:
+        counts = tally(journal.records())
     
     print(f"\n{'='*50}")
-    print(f"📊 스크리닝 결과:")
-    print(f"  🟢 High:       {len(high)}편 → Zotero에 추가")
-    print(f"  🟡 Medium:     {len(medium)}편 → 초록 한번 더 확인")
-    print(f"  ⚪ Low:        {len(low)}편 → 나중에 필요하면")
-    print(f"  ❌ Irrelevant: {len(irrelevant)}편 → 무시")
-    print(f"  ⚔️  반론:       {len(counter)}편 → 반드시 포함")
+    print(f"📊 스크리닝 결과 (총 {counts['total']}편):")
+    print(f"  🟢 High:       {counts['high']}편 → Zotero에 추가")
+    print(f"  🟡 Medium:     {counts['medium']}편 → 초록 한번 더 확인")
+    print(f"  ⚪ Low:        {counts['low']}편 → 나중에 필요하면")
+    print(f"  ❌ Irrelevant: {counts['irrelevant']}편 → 무시")
+    print(f"  ⚔️  반론:       {counts['counter']}편 → 반드시 포함")
     print(f"{'='*50}")
     
-    # 결과 저장
+    # 결과는 배치마다 저널(이어하기용)에 이미 기록됨 → 보고서와 결과 JSON은 저널에서 만든다
     if write_mode:
-        # 마크다운 보고서
-        lines = []
-        lines.append(f"# 🔍 AI 스크리닝 결과")
-        lines.append(f"\n> 원본: {csv_path.name}")
-        lines.append(f"> 총 {len(all_results)}편 중 관련 {len(high) + len(medium)}편")
-        lines.append(f"> 날짜: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        lines.append("")
-        
-        lines.append("## 🟢 High Relevance — Zotero에 추가하세요")
-        lines.append("")
-        for p in high:
-            lines.append(f"### {p['title']}")
-            lines.append(f"- **Authors:** {p.get('authors', '?')}")
-            lines.append(f"- **Year:** {p.get('year', '?')}")
-            lines.append(f"- **Journal:** {p.get('journal', '?')}")
-            if p.get('doi'):
-                lines.append(f"- **DOI:** https://doi.org/{p['doi']}")
-            lines.append(f"- **이유:** {p.get('reason', '')}")
-            lines.append(f"- **섹션:** {p.get('section_fit', '')}")
-            if p.get('is_counterargument'):
-                lines.append(f"- ⚔️ **반론 논문**")
-            lines.append("")
-        
-        lines.append("## 🟡 Medium Relevance — 초록 확인 후 판단")
-        lines.append("")
-        for p in medium:
-            lines.append(f"- **{p['title']}** ({p.get('year','?')}) — {p.get('reason','')}")
-        lines.append("")
-        
-        lines.append("## ⚔️ 반론 논문 — 반드시 포함")
-        lines.append("")
-        for p in counter:
-            lines.append(f"- **{p['title']}** ({p.get('year','?')}) — {p.get('reason','')}")
-        lines.append("")
-        
-        output_file = OUTPUT_DIR / f"screening_{datetime.now().strftime('%Y%m%d_%H%M')}.md"
-        output_file.write_text('\n'.join(lines), encoding='utf-8')
         print(f"\n📋 결과 저장: {output_file}")
-        
-        # JSON도 저장
-        json_file = OUTPUT_DIR / f"screening_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-        json_file.write_text(json.dumps(all_results, ensure_ascii=False, indent=2), encoding='utf-8')
-    
+        print(f"   결과 JSON: {json_file}")
     else:
-        print(f"\n💡 결과 저장: python3 ai_screener.py {csv_path} --write")
+        print(f"\n💡 보고서 저장: python3 ai_screener.py {csv_path} --write")
+    print(f"   저널: {journal.path}")
     
     print(f"\n다음 단계:")
     print(f"  1. 🟢 High 논문을 Zotero에 추가")
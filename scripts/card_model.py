@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""리서치 카드 frontmatter 공용 파서.
+
+generate_index / citation_paragraph_builder / track_progress가 함께 쓴다.
+카드 파일은 맨 앞 ``---`` 부터 닫는 ``---`` 줄까지만 읽으므로, 긴 본문
+(초록, 메모)은 디스크에서 읽지도 디코딩하지도 않는다. 카드가 많으면
+map_cards()가 읽기+파싱을 프로세스 풀에 청크 단위로 나눠 맡긴다 (--jobs).
+
+frontmatter 규칙 (sync_and_analyze.make_card가 쓰는 형식):
+  key: "value"         → fields[key] (따옴표 제거)
+  key:                 → fields[key] = "" 이고, 이어지는 "- item" 줄들은 lists[key]
+  # 주석 / 빈 줄       → 무시
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+HEAD_CHUNK = 4096
+PARALLEL_MIN_CARDS = 2000  # 이보다 적으면 프로세스 풀 기동 비용이 더 크다
+
+# 닫는 --- 줄. 앞에 \r?를 두면 리터럴 접두어 최적화가 꺼져 검색이 10배 느려지므로
+# CRLF 파일에서 헤더 끝에 남는 \r은 parse_header의 strip()에 맡긴다.
+_CLOSING = re.compile(rb"\n---[ \t]*(?:\r?\n|$)")
+_CLOSING_TEXT = re.compile(r"\n---[ \t]*(?:\r?\n|$)")
+
+
+class CardMeta:
+    """카드 한 장의 frontmatter (dict 대신 __slots__ 레코드)."""
+
+    __slots__ = ("filename", "fields", "lists")
+
+    def __init__(self, filename: str, fields: dict | None = None, lists: dict | None = None):
+        self.filename = filename
+        self.fields = fields if fields is not None else {}
+        self.lists = lists if lists is not None else {}
+
+    @property
+    def tags(self) -> list[str]:
+        return self.lists.get("tags", [])
+
+    @property
+    def authors(self) -> list[str]:
+        return self.lists.get("authors", [])
+
+    @property
+    def title(self) -> str:
+        return self.fields.get("title") or self.filename
+
+    def get(self, key: str, default=None):
+        if key == "filename":
+            return self.filename
+        items = self.lists.get(key)
+        if items:
+            return items
+        # 값도 항목도 없는 "key:" 줄은 예전 파서처럼 빈 문자열
+        return self.fields.get(key, default)
+
+    def __getitem__(self, key: str):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return key == "filename" or key in self.lists or key in self.fields
+
+    def __reduce__(self):
+        # 기본 __slots__ pickle 경로(copyreg)보다 훨씬 싸다 — 프로세스 풀 결과 전송용
+        return CardMeta, (self.filename, self.fields, self.lists)
+
+    def to_json(self) -> list:
+        return [self.filename, self.fields, self.lists]
+
+    @classmethod
+    def from_json(cls, raw: list) -> "CardMeta":
+        return cls(*raw)
+
+    def __repr__(self) -> str:
+        return f"CardMeta({self.filename!r})"
+
+
+_MISSING = object()
+
+
+def parse_header(header: str, filename: str) -> CardMeta:
+    """frontmatter 본문(--- 사이 텍스트) → CardMeta"""
+    fields: dict[str, str] = {}
+    lists: dict[str, list[str]] = {}
+    current = None
+    for line in header.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] == "-":
+            if current is not None and line[1:2] == " ":
+                current.append(line[2:].strip().strip('"').strip("'"))
+            continue
+        current = None
+        if line[0] == "#":
+            continue
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        value = value.strip()
+        # 키는 카드마다 같으니 intern해서 메모리와 pickle 크기를 줄인다
+        key = sys.intern(key.strip())
+        if value:
+            fields[key] = value.strip('"').strip("'")
+        else:
+            fields[key] = ""
+            current = lists[key] = []
+    return CardMeta(filename, fields, lists)
+
+
+def split_frontmatter(text: str) -> tuple[str | None, str]:
+    """카드 전체 텍스트 → (frontmatter, 본문). frontmatter가 없으면 (None, text)."""
+    if not text.startswith("---"):
+        return None, text
+    m = _CLOSING_TEXT.search(text, 3)
+    if m is None:
+        return None, text
+    return text[3:m.start()], text[m.end():]
+
+
+def parse_card_text(text: str, filename: str) -> CardMeta:
+    header, _ = split_frontmatter(text)
+    if header is None:
+        return CardMeta(filename)
+    return parse_header(header, filename)
+
+
+def extract_section_text(content: str, heading: str) -> str:
+    """`## heading` 섹션 본문 (다음 ## 전까지, 앞뒤 공백 제거). 없으면 빈 문자열."""
+    pattern = re.compile(rf"^##\s+{re.escape(heading)}\s*$", re.MULTILINE)
+    match = pattern.search(content)
+    if not match:
+        return ""
+
+    start = match.end()
+    rest = content[start:]
+    next_heading = re.search(r"\n##\s+", rest)
+    if next_heading:
+        rest = rest[: next_heading.start()]
+    return rest.strip()
+
+
+def read_header(path: Path) -> str | None:
+    """파일 앞부분에서 frontmatter만 읽는다 (닫는 --- 를 찾을 때까지 청크를 늘려가며)."""
+    with open(path, "rb") as f:
+        buf = f.read(HEAD_CHUNK)
+        if not buf.startswith(b"---"):
+            return None
+        eof = len(buf) < HEAD_CHUNK
+        while True:
+            m = _CLOSING.search(buf, 3)
+            # 버퍼 끝에 걸린 "---"는 다음 줄이 "----"일 수도 있으니 더 읽어 본다
+            if m is not None and (m.end() < len(buf) or eof):
+                return buf[3:m.start()].decode("utf-8", errors="replace")
+            if eof:
+                return None
+            more = f.read(max(HEAD_CHUNK, len(buf)))
+            eof = not more or len(more) < max(HEAD_CHUNK, len(buf))
+            buf += more
+
+
+def read_card_meta(path: Path) -> CardMeta:
+    header = read_header(path)
+    if header is None:
+        return CardMeta(path.stem)
+    return parse_header(header, path.stem)
+
+
+def _map_chunk(fn, paths):
+    return [fn(Path(p)) for p in paths]
+
+
+def map_cards(fn, paths, jobs: int | None = None, chunk_size: int | None = None) -> list:
+    """paths 순서 그대로 [fn(path), ...] 반환.
+
+    jobs가 None이면 카드가 PARALLEL_MIN_CARDS 이상일 때만 CPU 코어 수만큼 쓴다.
+    파싱은 순수 파이썬이라 GIL에 묶이므로 스레드가 아닌 프로세스 풀을 쓰고,
+    fn은 모듈 최상위 함수여야 한다 (pickle). 워커당 여러 청크를 나눠 줘서
+    느린 디스크/큰 카드가 한 워커에 몰려도 나머지가 기다리지 않게 한다.
+    """
+    paths = list(paths)
+    if jobs is None:
+        jobs = (os.cpu_count() or 1) if len(paths) >= PARALLEL_MIN_CARDS else 1
+    jobs = max(1, min(jobs, len(paths)))
+    if jobs == 1:
+        return [fn(p) for p in paths]
+
+    chunk_size = chunk_size or max(64, -(-len(paths) // (jobs * 4)))
+    names = [os.fspath(p) for p in paths]  # Path보다 str이 pickle이 몇 배 싸다
+    chunks = [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for part in pool.map(_map_chunk, [fn] * len(chunks), chunks):
+            results.extend(part)
+    return results
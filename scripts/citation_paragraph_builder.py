@@ -9,70 +9,14 @@ import re
 from datetime import datetime
 from pathlib import Path
 
+from card_model import extract_section_text, map_cards, parse_card_text
+from search import CardSearchIndex
+
 BASE_DIR = Path.home() / "ResearchOS"
 CARDS_DIR = BASE_DIR / "02_cards_basic"
 SECTIONS_DIR = BASE_DIR / "06_thesis" / "sections"
 
 
-def parse_frontmatter(content: str) -> dict:
-    data = {"authors_list": []}
-    if not content.startswith("---"):
-        return data
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return data
-
-    fm_lines = parts[1].splitlines()
-    in_tags = False
-    in_authors = False
-    tags = []
-    for raw in fm_lines:
-        line = raw.strip()
-        if not line:
-            continue
-
-        if line == "authors:":
-            in_authors = True
-            continue
-
-        if in_authors:
-            if line.startswith("- "):
-                data["authors_list"].append(line[2:].strip().strip('"').strip("'"))
-                continue
-            in_authors = False
-
-        if line == "tags:":
-            in_tags = True
-            continue
-
-        if in_tags:
-            if line.startswith("- "):
-                tags.append(line[2:].strip().strip('"').strip("'"))
-                continue
-            in_tags = False
-
-        if ":" in line and not line.startswith("#") and not line.startswith("-"):
-            key, _, value = line.partition(":")
-            data[key.strip()] = value.strip().strip('"').strip("'")
-
-    data["tags"] = tags
-    return data
-
-
-def extract_section_text(content: str, heading: str) -> str:
-    pattern = re.compile(rf"^##\s+{re.escape(heading)}\s*$", re.MULTILINE)
-    match = pattern.search(content)
-    if not match:
-        return ""
-
-    start = match.end()
-    rest = content[start:]
-    next_heading = re.search(r"\n##\s+", rest)
-    if next_heading:
-        rest = rest[: next_heading.start()]
-    return rest.strip()
-
-
 def split_sentences(text: str) -> list[str]:
     text = re.sub(r"\s+", " ", text).strip()
     if not text:
@@ -205,32 +149,50 @@ def build_claim_template(title: str, evidence: list[str]) -> str:
     return "선행연구 결과를 종합하면 해당 변인은 정신건강 결과에 의미 있는 설명력을 가진다."
 
 
-def load_cards() -> list[dict]:
-    cards = []
-    for path in sorted(CARDS_DIR.glob("*.md")):
-        content = path.read_text(encoding="utf-8", errors="replace")
-        fm = parse_frontmatter(content)
-        abstract = extract_section_text(content, "Abstract")
-        cards.append(
-            {
-                "path": path,
-                "title": fm.get("title", path.stem),
-                "year": fm.get("year", "n.d."),
-                "authors": fm.get("authors", ""),
-                "authors_list": fm.get("authors_list", []),
-                "zotero_key": fm.get("zotero_key", ""),
-                "doi": fm.get("DOI", fm.get("doi", "")),
-                "journal": fm.get("journal", ""),
-                "volume": fm.get("volume", ""),
-                "issue": fm.get("issue", ""),
-                "pages": fm.get("page", fm.get("pages", "")),
-                "priority": fm.get("reading_priority", "to-read"),
-                "relevance": float(fm.get("relevance_score", 0) or 0),
-                "abstract": abstract,
-                "tags": fm.get("tags", []),
-            }
-        )
-    return cards
+def load_card(path: Path) -> dict:
+    content = path.read_text(encoding="utf-8", errors="replace")
+    fm = parse_card_text(content, path.stem)
+    abstract = extract_section_text(content, "Abstract")
+    return {
+        "path": path,
+        "title": fm.get("title", path.stem),
+        "year": fm.get("year", "n.d."),
+        "authors": fm.fields.get("authors", ""),
+        "authors_list": fm.authors,
+        "zotero_key": fm.get("zotero_key", ""),
+        "doi": fm.get("DOI", fm.get("doi", "")),
+        "journal": fm.get("journal", ""),
+        "volume": fm.get("volume", ""),
+        "issue": fm.get("issue", ""),
+        "pages": fm.get("page", fm.get("pages", "")),
+        "priority": fm.get("reading_priority", "to-read"),
+        "relevance": float(fm.get("relevance_score", 0) or 0),
+        "abstract": abstract,
+        "tags": fm.tags,
+    }
+
+
+def load_cards(jobs: int | None = None, paths=None) -> list[dict]:
+    if paths is None:
+        paths = sorted(CARDS_DIR.glob("*.md"))
+    return map_cards(load_card, paths, jobs=jobs)
+
+
+def focus_candidates(focus_terms: list[str], limit: int, jobs: int | None = None) -> list[Path] | None:
+    """검색 색인(search.py)에서 제목·초록·태그에 초점 키워드가 있는 카드 경로.
+
+    맞는 카드가 limit편을 넘으면 None — BM25 순위로 자르면 나중에 우선순위/관련성으로
+    다시 정렬할 때 앞에 와야 할 카드가 말없이 빠지므로, 그때는 전체 카드를 훑는다.
+    """
+    index = CardSearchIndex()
+    try:
+        index.refresh(CARDS_DIR, jobs=jobs)
+        hits = index.search(focus_terms, limit=limit + 1, columns=("title", "abstract", "tags"))
+    finally:
+        index.close()
+    if len(hits) > limit:
+        return None
+    return sorted(CARDS_DIR / hit.name for hit in hits)
 
 
 def parse_focus_terms(raw: str) -> list[str]:
@@ -245,10 +207,24 @@ def main() -> None:
     parser.add_argument("--max", type=int, default=12, help="생성할 최대 문단 개수")
     parser.add_argument("--section", default="lit_review", help="출력 파일 섹션 이름")
     parser.add_argument("--min-relevance", type=float, default=0.0, help="최소 relevance 점수")
+    parser.add_argument("--jobs", type=int, default=None, help="카드 로딩 프로세스 수 (기본: 카드가 많을 때만 CPU 코어 수)")
+    parser.add_argument("--candidates", type=int, default=200,
+                        help="--focus 사용 시 검색 색인에서 먼저 고를 후보 카드 수 (기본 200, 더 많이 맞으면 전체 카드)")
     args = parser.parse_args()
 
     focus_terms = parse_focus_terms(args.focus)
-    cards = load_cards()
+    paths = None
+    if focus_terms:
+        limit = max(args.candidates, args.max)
+        paths = focus_candidates(focus_terms, limit, jobs=args.jobs)
+        if paths is None:
+            print(f"🔎 초점 키워드와 맞는 카드가 {limit}편을 넘어 전체 카드에서 고릅니다.")
+        elif paths:
+            print(f"🔎 초점 키워드 후보: {len(paths)}편")
+        else:
+            print("⚠️ 초점 키워드와 맞는 카드가 없어 전체 카드에서 고릅니다.")
+            paths = None
+    cards = load_cards(jobs=args.jobs, paths=paths)
     if not cards:
         print("❌ 카드가 없습니다. 먼저 sync_and_analyze.py를 실행하세요.")
         return
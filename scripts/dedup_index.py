@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""스크리닝 전 중복 제거 — DOI / 제목 지문 색인 (SQLite, logs/.state/dedup.sqlite3).
+
+여러 DB export(Scopus, PubMed, WoS …)를 차례로 스크리닝할 때 이미 본 논문과
+Zotero library.json에 이미 있는 논문을 점수화/LLM 호출 전에 걸러낸다.
+
+  DOI   소문자 + https://doi.org/ · doi: 접두어 제거 후 정확히 일치
+  제목  소문자 + 악센트/구두점 제거한 단어 집합의 MinHash (16비트 32개 = 8 band × 4 row).
+        band 하나라도 같은 논문만 후보로 꺼내(LSH) 단어 Jaccard ≥ TITLE_SIMILARITY로 확인한다.
+        단어가 MIN_TITLE_WORDS개 미만인 제목("Editorial" 등)은 DOI로만 비교한다.
+
+조회는 DOI 색인 1번 + LSH 키 8개 색인 조회라 지문 수와 무관하게 B-tree 깊이(log n)만큼만 든다.
+같은 export를 다시 돌리면(이어하기, --batch 회수) 지난번에 통과한 행은 그대로 통과한다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import unicodedata
+from array import array
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+from zotero_stream import iter_library_items
+
+BASE_DIR = Path.home() / "ResearchOS"
+DEDUP_DB = BASE_DIR / "logs" / ".state" / "dedup.sqlite3"
+ZOTERO_JSON = BASE_DIR / "01_zotero_export" / "library.json"
+ZOTERO_SOURCE = "zotero"
+
+NUM_BANDS, BAND_ROWS = 8, 4   # Jaccard 0.8 쌍을 후보로 잡을 확률 ≈ 98.5%
+TITLE_SIMILARITY = 0.8
+MIN_TITLE_WORDS = 4
+COMMIT_EVERY = 1000
+
+_DOI_PREFIX = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"[^\W_]+")
+_YEAR = re.compile(r"\d{4}")
+
+REASONS = {
+    "owned": "Zotero 보유",
+    "export": "이전 export",
+    "duplicate": "같은 CSV 내 중복",
+}
+
+
+def normalize_doi(doi) -> str:
+    doi = _DOI_PREFIX.sub("", str(doi or "").strip()).strip().rstrip(".,;").lower()
+    return doi if doi.startswith("10.") else ""
+
+
+def title_words(title) -> list[str]:
+    """제목 → 정규화한 단어 목록 (HTML 태그, 악센트, 구두점, 대소문자 무시)"""
+    text = _TAG.sub(" ", str(title or ""))
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    return _WORD.findall(text.casefold())
+
+
+def parse_year(value) -> int | None:
+    m = _YEAR.search(str(value or ""))
+    return int(m.group()) if m else None
+
+
+@lru_cache(maxsize=1 << 16)
+def _word_hashes(word: str) -> array:
+    # 단어 하나의 해시 32개 = blake2b 64바이트를 16비트씩 (순열 32개 대신 한 번의 C 호출)
+    return array("H", hashlib.blake2b(word.encode("utf-8"), digest_size=2 * NUM_BANDS * BAND_ROWS).digest())
+
+
+def band_keys(words) -> list[int]:
+    """단어 집합의 MinHash 서명 → band별 LSH 키 (band 번호 + 16비트 4개를 묶은 64비트 정수)"""
+    sig = array("H", map(min, zip(*map(_word_hashes, set(words)))))
+    raw = sig.tobytes()
+    step = 2 * BAND_ROWS
+    return [int.from_bytes(raw[i:i + step], "big", signed=True) ^ (band << 56)
+            for band, i in enumerate(range(0, len(raw), step))]
+
+
+def _title_keys(words) -> list[int]:
+    # 단어가 너무 적은 제목은 LSH에 넣지 않는다 (DOI로만 비교)
+    return band_keys(words) if len(set(words)) >= MIN_TITLE_WORDS else []
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class FingerprintIndex:
+    def __init__(self, path: Path = DEDUP_DB):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sources (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE,
+                sig TEXT NOT NULL DEFAULT ''
+            );
+            CREATE TABLE IF NOT EXISTS papers (
+                id INTEGER PRIMARY KEY,
+                source INTEGER NOT NULL,
+                row INTEGER NOT NULL,
+                doi TEXT,
+                title TEXT NOT NULL,
+                year INTEGER
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS papers_source_row ON papers(source, row);
+            CREATE INDEX IF NOT EXISTS papers_doi ON papers(doi) WHERE doi IS NOT NULL;
+            CREATE TABLE IF NOT EXISTS lsh (
+                key INTEGER NOT NULL,
+                paper INTEGER NOT NULL,
+                PRIMARY KEY (key, paper)
+            ) WITHOUT ROWID;
+            """
+        )
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            # 예전 버전이 papers만 지우고 남긴 LSH 키를 한 번 정리한다
+            self.conn.execute("DELETE FROM lsh WHERE paper NOT IN (SELECT id FROM papers)")
+            self.conn.execute("PRAGMA user_version = 1")
+            self.conn.commit()
+        self.dropped = Counter()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def _source(self, name: str, sig: str) -> int:
+        """출처 id. 파일이 바뀌었으면(sig) 그 출처의 행 번호가 더는 맞지 않으니 지문을 지운다."""
+        row = self.conn.execute("SELECT id, sig FROM sources WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return self.conn.execute("INSERT INTO sources (name, sig) VALUES (?, ?)", (name, sig)).lastrowid
+        sid, old = row
+        if old != sig:
+            self._delete(self.conn.execute("SELECT id, title FROM papers WHERE source = ?", (sid,)).fetchall())
+            self.conn.execute("UPDATE sources SET sig = ? WHERE id = ?", (sig, sid))
+        return sid
+
+    def _delete(self, rows) -> None:
+        """papers 행 [(id, title), ...]을 LSH 키와 함께 지운다.
+
+        키를 남기면 lsh가 export마다 끝없이 자라고, SQLite가 지운 id를 새 논문에 다시 주면
+        엉뚱한 논문을 후보로 가리킨다. 키는 저장된 제목 단어에서 다시 계산해 (key, paper) PK로 지운다.
+        """
+        self.conn.executemany(
+            "DELETE FROM lsh WHERE key = ? AND paper = ?",
+            [(key, pid) for pid, title in rows for key in _title_keys(title.split())],
+        )
+        self.conn.executemany("DELETE FROM papers WHERE id = ?", [(pid,) for pid, _ in rows])
+
+    def _match(self, doi, words, year, keys):
+        """이미 색인된 같은 논문의 (source, row), 없으면 None"""
+        if doi:
+            hit = self.conn.execute("SELECT source, row FROM papers WHERE doi = ? LIMIT 1", (doi,)).fetchone()
+            if hit:
+                return hit
+        if not keys:
+            return None
+        mine = set(words)
+        rows = self.conn.execute(
+            f"""
+            SELECT DISTINCT p.source, p.row, p.doi, p.title, p.year
+            FROM lsh JOIN papers p ON p.id = lsh.paper
+            WHERE lsh.key IN ({",".join("?" * len(keys))})
+            """,
+            keys,
+        )
+        for source, row, other_doi, title, other_year in rows:
+            if doi and other_doi and doi != other_doi:
+                continue
+            if year and other_year and abs(year - other_year) > 1:
+                continue
+            if _jaccard(mine, set(title.split())) >= TITLE_SIMILARITY:
+                return source, row
+        return None
+
+    def _insert(self, sid, row, doi, words, year, keys) -> None:
+        pid = self.conn.execute(
+            "INSERT INTO papers (source, row, doi, title, year) VALUES (?, ?, ?, ?, ?)",
+            (sid, row, doi or None, " ".join(words), year),
+        ).lastrowid
+        self.conn.executemany("INSERT OR IGNORE INTO lsh (key, paper) VALUES (?, ?)", [(k, pid) for k in keys])
+
+    def _fingerprint(self, title, doi, year):
+        words = title_words(title)
+        keys = _title_keys(words)
+        return normalize_doi(doi), words, parse_year(year), keys
+
+    def sync_library(self, path: Path = ZOTERO_JSON) -> int:
+        """library.json 아이템을 보유 논문으로 맞춘다 (파일이 바뀌었을 때 바뀐 아이템만). 반환값: 추가 수."""
+        if not path.exists():
+            return 0
+        st = path.stat()
+        sig = f"{st.st_mtime_ns}:{st.st_size}"
+        row = self.conn.execute("SELECT id, sig FROM sources WHERE name = ?", (ZOTERO_SOURCE,)).fetchone()
+        if row and row[1] == sig:
+            return 0
+        sid = row[0] if row else self.conn.execute(
+            "INSERT INTO sources (name) VALUES (?)", (ZOTERO_SOURCE,)).lastrowid
+        known = {r: (pid, title) for r, pid, title in self.conn.execute(
+            "SELECT row, id, title FROM papers WHERE source = ?", (sid,))}
+
+        added = 0
+        current = set()
+        for item in iter_library_items(path):
+            parts = item.get("issued", {}).get("date-parts", [[]])
+            doi, words, year, keys = self._fingerprint(
+                item.get("title", ""), item.get("DOI", item.get("doi", "")),
+                parts[0][0] if parts and parts[0] else None,
+            )
+            if not doi and not keys:
+                continue
+            # 행 번호 대신 지문 내용 해시 — 아이템이 고쳐지면 새 행이 되고 옛 행은 지워진다
+            key = int(hashlib.sha1(f"{doi}\x1f{' '.join(words)}\x1f{year}".encode()).hexdigest()[:15], 16)
+            if key in current:
+                continue
+            current.add(key)
+            if key not in known:
+                self._insert(sid, key, doi, words, year, keys)
+                added += 1
+        self._delete([known[r] for r in known.keys() - current])
+        self.conn.execute("UPDATE sources SET sig = ? WHERE id = ?", (sig, sid))
+        self.conn.commit()
+        return added
+
+    def filter(self, papers, source: str, sig: str = "", record: bool = True):
+        """papers(title/doi/year dict) 중 처음 보는 논문만 yield 하고 색인에 더한다.
+
+        source는 export 이름(CSV 경로), sig는 그 파일의 (mtime:크기). record=False면
+        이번 실행 안에서만 중복을 보고 close() 때 색인에 남기지 않는다.
+        """
+        sid = self._source(source, sig)
+        self.dropped = Counter()
+        zotero = self.conn.execute("SELECT id FROM sources WHERE name = ?", (ZOTERO_SOURCE,)).fetchone()
+        pending = 0
+        for row, p in enumerate(papers):
+            if self.conn.execute(
+                "SELECT 1 FROM papers WHERE source = ? AND row = ?", (sid, row)
+            ).fetchone():
+                yield p
+                continue
+            doi, words, year, keys = self._fingerprint(p.get("title", ""), p.get("doi", ""), p.get("year", ""))
+            hit = self._match(doi, words, year, keys)
+            if hit is not None:
+                self.dropped["owned" if zotero and hit[0] == zotero[0] else
+                             "duplicate" if hit[0] == sid else "export"] += 1
+                continue
+            self._insert(sid, row, doi, words, year, keys)
+            pending += 1
+            if record and pending >= COMMIT_EVERY:
+                self.conn.commit()
+                pending = 0
+            yield p
+        if record:
+            self.conn.commit()
+
+    def summary(self) -> str:
+        parts = [f"{REASONS[k]} {n}편" for k, n in self.dropped.items() if n]
+        return f"🧹 중복 제거 {sum(self.dropped.values())}편: " + " · ".join(parts) if parts else ""
+
+    def close(self, commit: bool = True) -> None:
+        if commit:
+            self.conn.commit()
+        else:
+            self.conn.rollback()
+        self.conn.close()
@@ -3,210 +3,65 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
+import argparse
+import hashlib
+import os
 from datetime import datetime
 from pathlib import Path
 
+from index_engine import IndexEngine
+
 CARDS_DIR = Path.home() / "ResearchOS" / "02_cards_basic"
 BASE_DIR = Path.home() / "ResearchOS"
+ENGINE_STATE = BASE_DIR / "logs" / ".state" / "index_engine.pickle"
 
+# 매 실행마다 바뀌는 줄 — 내용 비교에서 뺀다
+TIMESTAMP_PREFIX = "\n> 업데이트: "
 
-def parse_frontmatter(path: Path) -> dict:
-    content = path.read_text(encoding="utf-8", errors="replace")
-    data = {"filename": path.stem, "title": path.stem, "tags": []}
-
-    if not content.startswith("---"):
-        return data
-
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return data
-
-    fm_lines = parts[1].splitlines()
-
-    in_tags = False
-    for raw in fm_lines:
-        line = raw.strip()
-        if not line:
-            continue
-
-        if line == "tags:":
-            in_tags = True
-            continue
-
-        if in_tags:
-            if line.startswith("- "):
-                data["tags"].append(line[2:].strip().strip('"').strip("'"))
-                continue
-            in_tags = False
-
-        if line.startswith("#") or line.startswith("- "):
-            continue
-
-        if ":" in line:
-            key, _, value = line.partition(":")
-            data[key.strip()] = value.strip().strip('"').strip("'")
+# 이 프로세스가 마지막으로 쓴 출력: 경로 → ((mtime_ns, size), 내용 해시)
+_written: dict[Path, tuple[tuple[int, int], str]] = {}
 
-    return data
 
+def content_digest(text: str) -> str:
+    h = hashlib.sha1()
+    i = text.find(TIMESTAMP_PREFIX)
+    if i == -1:
+        h.update(text.encode("utf-8"))
+    else:
+        j = text.find("\n", i + 1)
+        h.update(text[:i].encode("utf-8"))
+        if j != -1:
+            h.update(text[j:].encode("utf-8"))
+    return h.hexdigest()
 
-def priority_emoji(priority: str) -> str:
-    return {
-        "must-read": "🔴",
-        "should-read": "🟡",
-        "reference-only": "⚪",
-        "to-read": "📘",
-    }.get(priority, "📘")
 
+def write_output(path: Path, content: str) -> bool:
+    """타임스탬프 말고 바뀐 게 있을 때만 쓴다 (임시 파일 → rename으로 원자적 교체).
 
-def to_float(value: str | int | float | None) -> float:
-    if value is None:
-        return 0.0
+    Obsidian/동기화 클라이언트가 매번 재색인·재업로드하지 않게 하고, 쓰는 도중에
+    읽혀도 반쯤 쓰인 파일이 보이지 않게 한다. 썼으면 True.
+    """
+    digest = content_digest(content)
     try:
-        return float(value)
-    except (TypeError, ValueError):
-        return 0.0
-
-
-def generate_master_index(cards: list[dict]) -> None:
-    lines = [
-        f"# 📚 마스터 인덱스 ({len(cards)}편)",
-        "",
-        f"> 업데이트: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-        "",
-        "| # | P | 제목 | 연도 | 방법론 | 관련성 |",
-        "|---|---|------|------|--------|--------|",
-    ]
-
-    for i, card in enumerate(cards, 1):
-        title = card.get("title", card["filename"])[:55]
-        link = f"[[02_cards_basic/{card['filename']}|{title}]]"
-        lines.append(
-            f"| {i} | {priority_emoji(card.get('reading_priority', 'to-read'))} | {link} | "
-            f"{card.get('year', '?')} | {card.get('method', '?')} | {card.get('relevance_score', '0')} |"
-        )
-
-    (BASE_DIR / "INDEX_MASTER.md").write_text("\n".join(lines), encoding="utf-8")
-
-
-def generate_topic_index(cards: list[dict]) -> None:
-    topic_map = defaultdict(list)
-    for card in cards:
-        for tag in card.get("tags", []):
-            if tag.lower().startswith("topic:"):
-                topic_map[tag.split(":", 1)[1].strip()].append(card)
-
-    axes = {
-        "🧠 Anxiety & Depression": ["anxiety", "depression", "mood", "cbt", "worry", "panic", "gad"],
-        "🤖 AI & Existential": ["ai", "automation", "meaning", "purpose", "identity", "existential", "unemployment"],
-        "🎨 Art & Mental Health": ["art", "therapy", "creative", "music", "expressive", "aesthetic", "flow"],
-    }
-
-    lines = ["# 🏷️ 주제별 인덱스", ""]
-    used_topics = set()
-    axis_fallback = {axis: [] for axis in axes}
-
-    for axis, keywords in axes.items():
-        # No topic tags: infer basic grouping from title/method text.
-        for card in cards:
-            haystack = " ".join(
-                [
-                    str(card.get("title", "")).lower(),
-                    str(card.get("method", "")).lower(),
-                    " ".join([t.lower() for t in card.get("tags", [])]),
-                ]
-            )
-            if any(k in haystack for k in keywords):
-                if card not in axis_fallback[axis]:
-                    axis_fallback[axis].append(card)
-
-        matches = {
-            topic: topic_cards
-            for topic, topic_cards in topic_map.items()
-            if any(k in topic.lower() for k in keywords)
-        }
-        if not matches:
-            continue
-
-        lines.append(f"## {axis}")
-        lines.append("")
-
-        for topic, topic_cards in sorted(matches.items()):
-            used_topics.add(topic)
-            lines.append(f"### {topic} ({len(topic_cards)}편)")
-            for card in sorted(topic_cards, key=lambda x: to_float(x.get("relevance_score")), reverse=True):
-                lines.append(
-                    f"- {priority_emoji(card.get('reading_priority', 'to-read'))} "
-                    f"[[02_cards_basic/{card['filename']}|{card.get('title', card['filename'])[:60]}]]"
-                )
-            lines.append("")
-
-    remaining = {topic: topic_cards for topic, topic_cards in topic_map.items() if topic not in used_topics}
-    if remaining:
-        lines.append("## 📂 Other")
-        lines.append("")
-        for topic, topic_cards in sorted(remaining.items()):
-            lines.append(f"### {topic} ({len(topic_cards)}편)")
-            for card in sorted(topic_cards, key=lambda x: to_float(x.get("relevance_score")), reverse=True):
-                lines.append(f"- [[02_cards_basic/{card['filename']}|{card.get('title', card['filename'])[:60]}]]")
-            lines.append("")
-
-    if not topic_map:
-        lines.append("## 자동 추론 분류 (topic 태그 없음)")
-        lines.append("")
-        for axis, inferred_cards in axis_fallback.items():
-            if not inferred_cards:
-                continue
-            lines.append(f"### {axis} ({len(inferred_cards)}편)")
-            for card in sorted(inferred_cards, key=lambda x: to_float(x.get("relevance_score")), reverse=True):
-                lines.append(
-                    f"- {priority_emoji(card.get('reading_priority', 'to-read'))} "
-                    f"[[02_cards_basic/{card['filename']}|{card.get('title', card['filename'])[:60]}]]"
-                )
-            lines.append("")
-
-    (BASE_DIR / "INDEX_TOPIC.md").write_text("\n".join(lines), encoding="utf-8")
-
-
-def generate_priority_index(cards: list[dict]) -> None:
-    grouped = defaultdict(list)
-    for card in cards:
-        grouped[card.get("reading_priority", "to-read")].append(card)
-
-    lines = [
-        "# 📖 읽기 우선순위",
-        "",
-        "| P | 편수 |",
-        "|--|------|",
-        f"| 🔴 Must | {len(grouped.get('must-read', []))} |",
-        f"| 🟡 Should | {len(grouped.get('should-read', []))} |",
-        f"| 📘 To-read | {len(grouped.get('to-read', []))} |",
-        f"| ⚪ Ref | {len(grouped.get('reference-only', []))} |",
-        "",
-    ]
-
-    for priority, emoji, label in [
-        ("must-read", "🔴", "Must-Read"),
-        ("should-read", "🟡", "Should-Read"),
-        ("to-read", "📘", "To-Read"),
-        ("reference-only", "⚪", "Reference-Only"),
-    ]:
-        items = sorted(grouped.get(priority, []), key=lambda x: to_float(x.get("relevance_score")), reverse=True)
-        if not items:
-            continue
-        lines.append(f"## {emoji} {label}")
-        lines.append("")
-        for card in items:
-            lines.append(
-                f"- [ ] [[02_cards_basic/{card['filename']}|{card.get('title', card['filename'])[:60]}]] "
-                f"({card.get('year', '?')})"
-            )
-        lines.append("")
-
-    (BASE_DIR / "INDEX_PRIORITY.md").write_text("\n".join(lines), encoding="utf-8")
-
-
-def generate_dataview() -> None:
+        st = path.stat()
+        sig = (st.st_mtime_ns, st.st_size)
+        known = _written.get(path)
+        # 직접 쓴 뒤로 손대지 않은 파일이면 다시 읽지 않는다
+        current = known[1] if known and known[0] == sig else content_digest(path.read_text(encoding="utf-8"))
+        if current == digest:
+            _written[path] = (sig, digest)
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    tmp = path.with_name(f".{path.name}.tmp")  # 점 파일이라 Obsidian이 무시한다
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
+    st = path.stat()
+    _written[path] = ((st.st_mtime_ns, st.st_size), digest)
+    return True
+
+
+def generate_dataview() -> bool:
     content = """# 📊 비교 테이블 (Dataview)
 
 ```dataview
@@ -224,27 +79,48 @@ WHERE reading_priority = \"must-read\"
 SORT relevance_score DESC
 ```
 """
-    (BASE_DIR / "COMPARE_DATAVIEW.md").write_text(content, encoding="utf-8")
+    return write_output(BASE_DIR / "COMPARE_DATAVIEW.md", content)
 
 
-def main() -> None:
-    cards = [parse_frontmatter(path) for path in sorted(CARDS_DIR.glob("*.md"))]
+def update_indexes(names=None, jobs: int | None = None, engine: IndexEngine | None = None,
+                   save: bool = True) -> IndexEngine:
+    """인덱스 엔진을 카드 폴더와 맞추고 INDEX_*.md를 다시 낸다.
+
+    names: 바뀐 카드 파일명 목록 (None이면 폴더 전체를 stat으로 훑는다).
+    engine: 상주 프로세스가 들고 있는 엔진 (None이면 디스크에서 로드).
+    save: 바뀐 상태를 디스크에 저장할지. 상주 프로세스는 False로 두고
+          종료할 때 engine.save()를 부르면 업데이트마다 전체를 pickle하지 않는다.
+    """
+    if engine is None:
+        engine = IndexEngine.load(ENGINE_STATE)
+    changed = engine.refresh(CARDS_DIR, names=names, jobs=jobs)
+    if changed and save:
+        engine.save(ENGINE_STATE)
 
-    if not cards:
+    if not len(engine):
         print("카드 없음")
-        return
+        return engine
+
+    updated = datetime.now().strftime("%Y-%m-%d %H:%M")
+    outputs = [
+        (f"INDEX_MASTER.md ({len(engine)}편)", write_output(BASE_DIR / "INDEX_MASTER.md", engine.master_index(updated))),
+        ("INDEX_TOPIC.md", write_output(BASE_DIR / "INDEX_TOPIC.md", engine.topic_index())),
+        ("INDEX_PRIORITY.md", write_output(BASE_DIR / "INDEX_PRIORITY.md", engine.priority_index())),
+        ("COMPARE_DATAVIEW.md", generate_dataview()),
+    ]
+    for label, written in outputs:
+        print(f"✅ {label}" if written else f"⏭️ {label} — 변경 없음")
+    return engine
 
-    cards = sorted(cards, key=lambda x: to_float(x.get("relevance_score")), reverse=True)
 
-    generate_master_index(cards)
-    generate_topic_index(cards)
-    generate_priority_index(cards)
-    generate_dataview()
+def main() -> None:
+    parser = argparse.ArgumentParser(description="카드 인덱스(INDEX_*.md) 생성")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="카드 파싱 프로세스 수 (기본: 카드가 많을 때만 CPU 코어 수)")
+    parser.add_argument("--rebuild", action="store_true", help="저장된 인덱스 상태를 버리고 처음부터 다시 만든다")
+    args = parser.parse_args()
 
-    print(f"✅ INDEX_MASTER.md ({len(cards)}편)")
-    print("✅ INDEX_TOPIC.md")
-    print("✅ INDEX_PRIORITY.md")
-    print("✅ COMPARE_DATAVIEW.md")
+    update_indexes(jobs=args.jobs, engine=IndexEngine() if args.rebuild else None)
 
 
 if __name__ == "__main__":
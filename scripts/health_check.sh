@@ -39,7 +39,7 @@ fi
 
 echo ""
 echo "📝 Core scripts:"
-for script in sync_and_analyze.py generate_index.py ai_screener.py citation_paragraph_builder.py track_progress.py run_sync.sh; do
+for script in sync_and_analyze.py generate_index.py ai_screener.py citation_paragraph_builder.py track_progress.py run_sync.sh watch_sync.py search.py; do
     if [ -f "$BASE_DIR/scripts/$script" ]; then
         if [ -x "$BASE_DIR/scripts/$script" ]; then
             echo "  ✅ $script"
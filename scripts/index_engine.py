@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""증분 인덱스 엔진 — INDEX_MASTER / INDEX_TOPIC / INDEX_PRIORITY 본문을 만든다.
+
+카드마다 렌더링한 행(row)과, 관련성 순으로 정렬된 키 리스트(마스터 순서,
+topic·priority·축별 그룹)를 들고 있다가 logs/.state/index_engine.pickle 에
+저장한다. 다음 실행에서는 (mtime, 크기)가 바뀐 카드만 다시 파싱해서 그 카드의
+키를 bisect로 빼고 넣고, 그 카드가 속했던/속하게 된 섹션만 다시 렌더링한다.
+나머지 섹션은 캐시된 텍스트를 이어 붙이기만 한다.
+
+정렬 키는 (-relevance, 파일명)이다. 예전 전체 재생성(파일명순 로드 → relevance
+내림차순 안정 정렬)과 같은 순서라 출력이 바이트 단위로 같다.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import pickle
+from bisect import bisect_left
+from itertools import count
+from operator import attrgetter
+from pathlib import Path
+
+from card_model import CardMeta, map_cards, read_card_meta
+
+ENGINE_VERSION = 1
+
+AXES = {
+    "🧠 Anxiety & Depression": ["anxiety", "depression", "mood", "cbt", "worry", "panic", "gad"],
+    "🤖 AI & Existential": ["ai", "automation", "meaning", "purpose", "identity", "existential", "unemployment"],
+    "🎨 Art & Mental Health": ["art", "therapy", "creative", "music", "expressive", "aesthetic", "flow"],
+}
+
+PRIORITIES = [
+    ("must-read", "🔴", "Must-Read"),
+    ("should-read", "🟡", "Should-Read"),
+    ("to-read", "📘", "To-Read"),
+    ("reference-only", "⚪", "Reference-Only"),
+]
+
+TOPIC, PRIORITY, AXIS = "topic", "priority", "axis"
+
+
+def priority_emoji(priority: str) -> str:
+    return {
+        "must-read": "🔴",
+        "should-read": "🟡",
+        "reference-only": "⚪",
+        "to-read": "📘",
+    }.get(priority, "📘")
+
+
+def to_float(value: str | int | float | None) -> float:
+    if value is None:
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def card_haystack(card: CardMeta) -> str:
+    """topic 태그가 없을 때 축 추론에 쓰는 텍스트 (제목 + 방법 + 태그, 소문자)"""
+    return " ".join(
+        [
+            str(card.get("title", "")).lower(),
+            str(card.get("method", "")).lower(),
+            " ".join([t.lower() for t in card.get("tags", [])]),
+        ]
+    )
+
+
+class CardEntry:
+    """카드 한 장의 인덱스 상태: 시그니처, 정렬 키, 소속 그룹, 렌더링된 행."""
+
+    __slots__ = ("sig", "key", "groups", "master", "emoji", "plain", "todo")
+
+    def __init__(self, sig, card: CardMeta, name: str):
+        self.sig = sig
+        relevance = to_float(card.get("relevance_score"))
+        if math.isnan(relevance):
+            relevance = 0.0  # NaN은 bisect 순서를 깨뜨린다
+        self.key = (-relevance, name)
+
+        priority = card.fields.get("reading_priority", "to-read")
+        groups = {(PRIORITY, priority)}
+        for tag in card.get("tags", []):
+            if tag.lower().startswith("topic:"):
+                groups.add((TOPIC, tag.split(":", 1)[1].strip()))
+        haystack = card_haystack(card)
+        for axis, keywords in AXES.items():
+            if any(k in haystack for k in keywords):
+                groups.add((AXIS, axis))
+        self.groups = tuple(groups)
+
+        fn = card["filename"]
+        emoji = priority_emoji(priority)
+        link = f"[[02_cards_basic/{fn}|{card.get('title', fn)[:60]}]]"
+        self.master = (
+            f" | {emoji} | [[02_cards_basic/{fn}|{card.get('title', fn)[:55]}]] | "
+            f"{card.get('year', '?')} | {card.get('method', '?')} | {card.get('relevance_score', '0')} |"
+        )
+        self.emoji = f"- {emoji} {link}"
+        self.plain = f"- {link}"
+        self.todo = f"- [ ] {link} ({card.get('year', '?')})"
+
+
+class SortedGroup:
+    """정렬된 키 리스트 + 같은 순서의 CardEntry 리스트 (출력은 C 레벨 join으로)"""
+
+    __slots__ = ("keys", "entries")
+
+    def __init__(self):
+        self.keys: list[tuple] = []
+        self.entries: list[CardEntry] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def insert(self, entry: CardEntry) -> None:
+        i = bisect_left(self.keys, entry.key)
+        self.keys.insert(i, entry.key)
+        self.entries.insert(i, entry)
+
+    def remove(self, entry: CardEntry) -> None:
+        i = bisect_left(self.keys, entry.key)
+        if i < len(self.keys) and self.keys[i] == entry.key:
+            del self.keys[i]
+            del self.entries[i]
+
+    def rows(self, style: str):
+        return map(attrgetter(style), self.entries)
+
+
+class IndexEngine:
+    def __init__(self):
+        self.version = ENGINE_VERSION
+        self.entries: dict[str, CardEntry] = {}        # "파일명.md" → CardEntry
+        self.order = SortedGroup()                     # 마스터 인덱스 순서
+        self.groups: dict[tuple, SortedGroup] = {}     # (종류, 이름) → 그룹
+        self.sections: dict[tuple, str] = {}           # (그룹, 스타일) → 렌더링된 섹션
+
+    # ── 저장/로드 ──────────────────────────────────────────
+
+    @classmethod
+    def load(cls, path: Path) -> "IndexEngine":
+        try:
+            with open(path, "rb") as f:
+                engine = pickle.load(f)
+            if isinstance(engine, cls) and engine.version == ENGINE_VERSION:
+                return engine
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, TypeError):
+            pass
+        return cls()
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    # ── 델타 적용 ──────────────────────────────────────────
+
+    def _remove(self, name: str) -> None:
+        entry = self.entries.pop(name)
+        self.order.remove(entry)
+        for group in entry.groups:
+            members = self.groups[group]
+            members.remove(entry)
+            if not members:
+                del self.groups[group]
+            self._invalidate(group)
+
+    def _add(self, name: str, sig, card: CardMeta) -> None:
+        entry = CardEntry(sig, card, name)
+        self.entries[name] = entry
+        self.order.insert(entry)
+        for group in entry.groups:
+            members = self.groups.get(group)
+            if members is None:
+                members = self.groups[group] = SortedGroup()
+            members.insert(entry)
+            self._invalidate(group)
+
+    def _invalidate(self, group: tuple) -> None:
+        for style in ("emoji", "plain", "todo"):
+            self.sections.pop((group, style), None)
+
+    def refresh(self, cards_dir: Path, names=None, jobs: int | None = None) -> int:
+        """카드 폴더와 맞춰 본다. names를 주면 그 파일들만 확인한다 (watcher용).
+
+        반환값: 추가/수정/삭제된 카드 수.
+        """
+        current = {}
+        if names is None:
+            with os.scandir(cards_dir) as it:
+                for e in it:
+                    if e.name.endswith(".md") and not e.name.startswith(".") and e.is_file():
+                        st = e.stat()
+                        current[e.name] = (st.st_mtime_ns, st.st_size)
+            removed = [name for name in self.entries if name not in current]
+        else:
+            removed = []
+            for name in names:
+                try:
+                    st = (cards_dir / name).stat()
+                except FileNotFoundError:
+                    if name in self.entries:
+                        removed.append(name)
+                    continue
+                current[name] = (st.st_mtime_ns, st.st_size)
+
+        changed = [
+            name for name, sig in current.items()
+            if name not in self.entries or self.entries[name].sig != sig
+        ]
+        for name in removed:
+            self._remove(name)
+        if changed:
+            cards = map_cards(read_card_meta, [cards_dir / name for name in changed], jobs=jobs)
+            for name, card in zip(changed, cards):
+                if name in self.entries:
+                    self._remove(name)
+                self._add(name, current[name], card)
+        return len(removed) + len(changed)
+
+    # ── 출력 ──────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _section(self, group: tuple, style: str) -> str:
+        """그룹 하나의 섹션 텍스트 (캐시, 카드가 바뀐 그룹만 다시 만든다)"""
+        cached = self.sections.get((group, style))
+        if cached is not None:
+            return cached
+        kind, name = group
+        members = self.groups[group]
+        if kind == PRIORITY:
+            emoji, label = next((e, l) for p, e, l in PRIORITIES if p == name)
+            head = f"## {emoji} {label}\n\n"
+        else:
+            head = f"### {name} ({len(members)}편)\n"
+        text = head + "\n".join(members.rows(style)) + "\n"
+        self.sections[(group, style)] = text
+        return text
+
+    def master_index(self, updated: str) -> str:
+        lines = [
+            f"# 📚 마스터 인덱스 ({len(self.order)}편)",
+            "",
+            f"> 업데이트: {updated}",
+            "",
+            "| # | P | 제목 | 연도 | 방법론 | 관련성 |",
+            "|---|---|------|------|--------|--------|",
+        ]
+        rows = map("| {}{}".format, count(1), self.order.rows("master"))
+        return "\n".join(lines) + "\n" + "\n".join(rows)
+
+    def topic_index(self) -> str:
+        topics = sorted(name for kind, name in self.groups if kind == TOPIC)
+        parts = ["# 🏷️ 주제별 인덱스", ""]
+        used = set()
+        for axis, keywords in AXES.items():
+            matches = [t for t in topics if any(k in t.lower() for k in keywords)]
+            if not matches:
+                continue
+            parts += [f"## {axis}", ""]
+            for topic in matches:
+                used.add(topic)
+                parts.append(self._section((TOPIC, topic), "emoji"))
+
+        remaining = [t for t in topics if t not in used]
+        if remaining:
+            parts += ["## 📂 Other", ""]
+            parts += [self._section((TOPIC, t), "plain") for t in remaining]
+
+        if not topics:
+            parts += ["## 자동 추론 분류 (topic 태그 없음)", ""]
+            parts += [self._section((AXIS, axis), "emoji") for axis in AXES if (AXIS, axis) in self.groups]
+        return "\n".join(parts)
+
+    def priority_index(self) -> str:
+        def n_priority(priority):
+            return len(self.groups.get((PRIORITY, priority), []))
+
+        parts = [
+            "# 📖 읽기 우선순위",
+            "",
+            "| P | 편수 |",
+            "|--|------|",
+            f"| 🔴 Must | {n_priority('must-read')} |",
+            f"| 🟡 Should | {n_priority('should-read')} |",
+            f"| 📘 To-read | {n_priority('to-read')} |",
+            f"| ⚪ Ref | {n_priority('reference-only')} |",
+            "",
+        ]
+        parts += [
+            self._section((PRIORITY, priority), "todo")
+            for priority, _, _ in PRIORITIES
+            if (PRIORITY, priority) in self.groups
+        ]
+        return "\n".join(parts)
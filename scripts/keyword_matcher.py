@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""연구 키워드 다중 패턴 매처.
+
+키워드 집합을 한 번 컴파일해 두고, 텍스트 필드를 한 번만 훑어서
+포함된 키워드를 모두 찾는다. 결과는 ``kw in text`` 를 키워드마다
+돌린 것과 정확히 같다.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+
+
+def _trie_pattern(words: list[str]) -> str:
+    """공통 접두사를 묶은 정규식 (sre가 위치마다 트라이 깊이만큼만 비교)."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            # 여기서 끝나는 단어가 있어도 더 긴 매치를 우선 시도한다.
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """키워드 집합을 컴파일한 단일 패스 매처."""
+
+    __slots__ = ("keywords", "_size", "_counts", "_regex", "_implied")
+
+    def __init__(self, keywords):
+        keywords = list(keywords)
+        # 중복 키워드는 기존 루프처럼 점수에 여러 번 반영되도록 개수를 기억한다.
+        self._size = len(keywords)
+        self._counts = Counter(keywords)
+        self.keywords = tuple(self._counts)
+        self._regex = None
+        self._implied: dict[str, frozenset[str]] = {}
+        words = [k for k in self.keywords if k]
+        if not words:
+            return
+        # 각 위치에서는 가장 긴 키워드 하나만 잡히므로, 그 안에 들어있는
+        # 다른 키워드(부분 문자열)를 미리 계산해 두었다가 함께 돌려준다.
+        for kw in words:
+            self._implied[kw] = frozenset(k for k in words if k in kw)
+        self._regex = re.compile(_trie_pattern(words))
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def weight(self, found) -> int:
+        """found에 속한 키워드 개수 (중복 키워드 포함)."""
+        if len(self._counts) == self._size:
+            return len(found)
+        return sum(self._counts[k] for k in found)
+
+    def findall(self, text: str) -> set[str]:
+        """text 안에 부분 문자열로 등장하는 키워드 집합."""
+        found: set[str] = {""} if "" in self._counts else set()
+        if self._regex is None or not text:
+            return found
+        # 매치 시작 바로 다음 위치부터 다시 찾으므로 겹치는 키워드도 놓치지 않는다.
+        search = self._regex.search
+        seen: set[str] = set()
+        pos = 0
+        while True:
+            m = search(text, pos)
+            if m is None:
+                return found
+            longest = m.group()
+            if longest not in seen:
+                seen.add(longest)
+                found |= self._implied[longest]
+            pos = m.start() + 1
+
+    def count(self, text: str) -> int:
+        return self.weight(self.findall(text))
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""LLM 배치(Message Batches) 모드 — 밤새 돌리는 대량 스크리닝/카드 분석용.
+
+모든 프롬프트를 provider 배치 작업 하나로 제출하고, 작업 id를
+logs/.state/llm_batches.json에 저장한다. 작업이 끝나면 결과를 LLM 캐시에
+넣어 두므로, 같은 명령을 다시 실행하면 동기 경로가 전부 캐시 hit로 끝나면서
+카드/스크리닝 JSON에 반영된다. 중간에 프로세스가 죽어도 작업 id가 남아 있어
+재실행 시 이어서 폴링한다.
+
+custom_id로 캐시 키(SHA-256 hex, 64자)를 그대로 쓰므로 별도 매핑이 필요 없다.
+provider 호출은 BatchBackend 뒤에 숨겨져 있어, 테스트에서는 가짜 백엔드나
+로컬 가짜 배치 서버(ANTHROPIC_BASE_URL / OPENAI_BASE_URL)로 대체할 수 있다.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+
+from llm_client import LLM_CACHE, LLM_PROVIDER, get_client, llm_key, request_params
+
+JOBS_FILE = Path.home() / "ResearchOS" / "logs" / ".state" / "llm_batches.json"
+
+PENDING, ENDED, FAILED = "pending", "ended", "failed"
+
+
+class BatchBackend(ABC):
+    """provider 배치 API 인터페이스. 메서드가 하나라도 빠진 백엔드는 만들 때 TypeError."""
+
+    @abstractmethod
+    def submit(self, requests: list[tuple[str, dict]]) -> str:
+        """[(custom_id, request_params), ...] 제출 → 작업 id"""
+
+    @abstractmethod
+    def status(self, job_id: str) -> str:
+        """PENDING / ENDED / FAILED"""
+
+    @abstractmethod
+    def results(self, job_id: str):
+        """(custom_id, 응답 텍스트 또는 None) yield"""
+
+
+class AnthropicBatches(BatchBackend):
+    def __init__(self, client=None):
+        self.client = client or get_client("claude")
+
+    def submit(self, requests):
+        batch = self.client.messages.batches.create(
+            requests=[{"custom_id": cid, "params": params} for cid, params in requests]
+        )
+        return batch.id
+
+    def status(self, job_id):
+        batch = self.client.messages.batches.retrieve(job_id)
+        return ENDED if batch.processing_status == "ended" else PENDING
+
+    def results(self, job_id):
+        for entry in self.client.messages.batches.results(job_id):
+            if entry.result.type == "succeeded":
+                yield entry.custom_id, entry.result.message.content[0].text
+            else:
+                yield entry.custom_id, None
+
+
+class OpenAIBatches(BatchBackend):
+    ENDPOINT = "/v1/chat/completions"
+
+    def __init__(self, client=None):
+        self.client = client or get_client("openai")
+
+    def submit(self, requests):
+        lines = [
+            json.dumps({"custom_id": cid, "method": "POST", "url": self.ENDPOINT, "body": params},
+                       ensure_ascii=False)
+            for cid, params in requests
+        ]
+        upload = self.client.files.create(
+            file=("batch.jsonl", io.BytesIO("\n".join(lines).encode("utf-8"))), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=upload.id, endpoint=self.ENDPOINT, completion_window="24h"
+        )
+        return batch.id
+
+    def status(self, job_id):
+        batch = self.client.batches.retrieve(job_id)
+        if batch.status == "completed":
+            return ENDED
+        if batch.status in ("failed", "expired", "cancelled"):
+            return FAILED
+        return PENDING
+
+    def results(self, job_id):
+        batch = self.client.batches.retrieve(job_id)
+        if not batch.output_file_id:
+            return
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            response = row.get("response") or {}
+            if response.get("status_code") == 200:
+                yield row["custom_id"], response["body"]["choices"][0]["message"]["content"]
+            else:
+                yield row["custom_id"], None
+
+
+def default_backend() -> BatchBackend:
+    return AnthropicBatches() if LLM_PROVIDER == "claude" else OpenAIBatches()
+
+
+def load_jobs() -> dict:
+    if JOBS_FILE.exists():
+        return json.loads(JOBS_FILE.read_text(encoding="utf-8"))
+    return {}
+
+
+def save_jobs(jobs: dict) -> None:
+    JOBS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = JOBS_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(jobs, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp.replace(JOBS_FILE)
+
+
+def prepare_batch(name: str, prompts, backend: BatchBackend | None = None,
+                  wait: bool = False, poll_interval: float = 60) -> bool:
+    """prompts [(prompt, system_prompt), ...]의 응답을 배치로 받아 캐시에 채운다.
+
+    True: 모든 결과가 캐시에 들어왔다 (이제 동기 경로를 돌리면 된다).
+    False: 작업이 아직 진행 중이거나 실패했다.
+    """
+    if not LLM_CACHE.enabled:
+        print("⚠️ 배치 모드는 LLM 캐시가 필요합니다 (LLM_CACHE=0 해제).")
+        return False
+
+    jobs = load_jobs()
+    job = jobs.get(name)
+    if job is None:
+        todo = {}
+        for prompt, system_prompt in prompts:
+            key = llm_key(prompt, system_prompt)
+            if key not in todo and not LLM_CACHE.contains(key):
+                todo[key] = request_params(prompt, system_prompt)
+        if not todo:
+            return True
+        backend = backend or default_backend()
+        job_id = backend.submit(list(todo.items()))
+        job = {"id": job_id, "provider": LLM_PROVIDER, "count": len(todo),
+               "submitted": datetime.now().isoformat(timespec="seconds")}
+        jobs[name] = job
+        save_jobs(jobs)
+        print(f"📦 배치 제출: {job_id} ({len(todo)}건)")
+
+    backend = backend or default_backend()
+    while True:
+        status = backend.status(job["id"])
+        if status == ENDED:
+            ok = failed = 0
+            for custom_id, text in backend.results(job["id"]):
+                if text is None:
+                    failed += 1
+                    continue
+                LLM_CACHE.put(custom_id, text)
+                ok += 1
+            jobs.pop(name, None)
+            save_jobs(jobs)
+            print(f"📦 배치 완료: {job['id']} | 성공 {ok}건 · 실패 {failed}건 (실패분은 동기 호출로 처리)")
+            return True
+        if status == FAILED:
+            jobs.pop(name, None)
+            save_jobs(jobs)
+            print(f"❌ 배치 실패: {job['id']} — 다시 실행하면 새로 제출합니다.")
+            return False
+        if not wait:
+            print(f"⏳ 배치 진행 중: {job['id']} (제출 {job['submitted']}) — 끝나면 같은 명령을 다시 실행하세요.")
+            return False
+        time.sleep(poll_interval)
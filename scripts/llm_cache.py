@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""LLM 응답 디스크 캐시 (content-addressed, SQLite).
+
+키는 (provider, model, system prompt, prompt)의 SHA-256 해시. TTL이 지난 항목은
+무시하고, 전체 크기가 상한을 넘으면 가장 오래 안 쓴 항목부터 지운다 (LRU).
+
+환경변수:
+  LLM_CACHE=0              캐시 끄기
+  LLM_CACHE_TTL_DAYS=30    보관 기간
+  LLM_CACHE_MAX_MB=200     최대 크기
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+CACHE_PATH = Path.home() / "ResearchOS" / "logs" / ".state" / "llm_cache.sqlite3"
+
+
+def cache_key(provider: str, model: str, system_prompt: str, prompt: str) -> str:
+    raw = json.dumps([provider, model, system_prompt, prompt], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path: Path = CACHE_PATH, ttl_days: float = 30, max_mb: float = 200,
+                 enabled: bool = True):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self._conn = None
+        self._total = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMCache":
+        return cls(
+            ttl_days=float(os.getenv("LLM_CACHE_TTL_DAYS", "30")),
+            max_mb=float(os.getenv("LLM_CACHE_MAX_MB", "200")),
+            enabled=os.getenv("LLM_CACHE", "1") != "0",
+        )
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # 처음 쓸 때 연결 (캐시를 안 쓰는 실행은 파일을 만들지 않는다)
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+            # TTL이 지난 항목은 실행마다 한 번 정리하고, 이후 크기는 증분으로 추적
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+            self._total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+        return self._conn
+
+    def get(self, key: str) -> str | None:
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def contains(self, key: str) -> bool:
+        """hit/miss 통계에 잡히지 않는 존재 확인."""
+        if not self.enabled:
+            return False
+        with self.lock:
+            row = self.conn.execute("SELECT created FROM responses WHERE key = ?", (key,)).fetchone()
+        return row is not None and time.time() - row[0] <= self.ttl
+
+    def put(self, key: str, response: str) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._total += size - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+            self.conn.commit()
+
+    def discard(self, key: str) -> None:
+        """쓸 수 없는 응답(파싱 실패 등)을 지워서 다음 호출이 캐시가 아닌 API로 가게 한다."""
+        if not self.enabled:
+            return
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if old:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total -= old[0]
+                self.conn.commit()
+
+    def _evict(self) -> None:
+        """상한의 90% 아래로 내려갈 때까지 가장 오래 안 쓴 항목부터 삭제."""
+        target = self.max_bytes * 0.9
+        rows = self.conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+        stale = []
+        for key, size in rows:
+            if self._total <= target:
+                break
+            stale.append((key,))
+            self._total -= size
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"💾 LLM 캐시: hit {self.hits} / miss {self.misses} ({rate:.0f}%)"
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
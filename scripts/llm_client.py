@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""sync_and_analyze / ai_screener 공용 LLM 호출.
+
+캐시 조회 → (miss) RPM 제한 + 429·5xx·연결 오류 백오프를 거쳐 provider 호출 → 캐시 저장.
+provider 클라이언트는 프로세스당 하나만 만든다 (LLM_TIMEOUT: 요청 타임아웃 초, 기본 120).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from llm_cache import LLMCache, cache_key
+from llm_pool import RateLimitedCaller
+
+load_dotenv(Path.home() / "ResearchOS" / "secrets" / ".env")
+
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "claude").lower()
+MODELS = {
+    "claude": "claude-sonnet-4-20250514",
+    "openai": "gpt-4o-mini",
+}
+LLM_MODEL = MODELS["claude"] if LLM_PROVIDER == "claude" else MODELS["openai"]
+
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+MAX_TOKENS = 2000  # 응답 최대 토큰
+
+LLM_CALLER = RateLimitedCaller()
+LLM_CACHE = LLMCache.from_env()
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(provider=None):
+    """provider별 SDK 클라이언트를 프로세스당 한 번만 만들어 재사용.
+
+    SDK 클라이언트는 내부에 keep-alive 커넥션 풀을 갖고 있고 스레드 간
+    공유해도 안전하므로, 논문마다 새로 만들 때 생기던 TLS 핸드셰이크를 없앤다.
+    SDK 자체 재시도는 끈다 (max_retries=0) — 재시도는 RateLimitedCaller가 버킷을 거쳐 한다.
+    """
+    provider = provider or LLM_PROVIDER
+    client = _clients.get(provider)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(provider)
+        if client is None:
+            if provider == "claude":
+                from anthropic import Anthropic
+                client = Anthropic(timeout=LLM_TIMEOUT, max_retries=0)
+            else:
+                from openai import OpenAI
+                client = OpenAI(timeout=LLM_TIMEOUT, max_retries=0)
+            _clients[provider] = client
+    return client
+
+
+def llm_sdk_available():
+    if LLM_PROVIDER == "claude":
+        try:
+            import anthropic  # noqa: F401
+            return True
+        except ImportError:
+            return False
+    try:
+        import openai  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def request_params(prompt, system_prompt):
+    """provider API에 보낼 요청 본문 (동기 호출과 배치 모드가 공유)"""
+    if LLM_PROVIDER == "claude":
+        return {"model": LLM_MODEL, "max_tokens": MAX_TOKENS, "system": system_prompt,
+                "messages": [{"role":"user","content":prompt}]}
+    return {"model": LLM_MODEL,
+            "messages": [{"role":"system","content":system_prompt},{"role":"user","content":prompt}],
+            "temperature": 0.2, "max_tokens": MAX_TOKENS}
+
+
+def estimate_tokens(text):
+    """토큰 수 어림값 (토크나이저 없이). 영문은 약 4글자, 한글은 약 1.3글자에 1토큰 —
+    UTF-8 바이트 수 / 4가 두 경우 모두 약간 넉넉하게 맞는다."""
+    return len(text.encode("utf-8")) // 4 + 1
+
+
+def _request_llm(prompt, system_prompt):
+    try:
+        client = get_client()
+        if LLM_PROVIDER == "claude":
+            r = client.messages.create(**request_params(prompt, system_prompt))
+            return r.content[0].text
+        r = client.chat.completions.create(**request_params(prompt, system_prompt))
+        return r.choices[0].message.content
+    except ImportError as exc:
+        raise RuntimeError(
+            f"LLM SDK가 설치되지 않았습니다. provider={LLM_PROVIDER}"
+        ) from exc
+
+
+def llm_key(prompt, system_prompt):
+    return cache_key(LLM_PROVIDER, LLM_MODEL, system_prompt, prompt)
+
+
+def call_llm(prompt, system_prompt, parse=None):
+    """LLM 호출 (디스크 캐시 → RPM 제한 + 429·5xx·연결 오류 백오프)
+
+    parse(text)를 주면 그 결과를 돌려주고, parse가 예외 없이 끝난 응답만 캐시에 남긴다.
+    캐시에 있던 응답(예: 배치 결과)이 parse에 실패하면 지우고 API를 다시 부른다.
+    """
+    key = llm_key(prompt, system_prompt)
+    cached = LLM_CACHE.get(key)
+    if cached is not None:
+        if parse is None:
+            return cached
+        try:
+            return parse(cached)
+        except Exception:
+            LLM_CACHE.discard(key)
+    text = LLM_CALLER.call(_request_llm, prompt, system_prompt)
+    result = text if parse is None else parse(text)  # 실패하면 캐시에 넣지 않고 예외를 넘긴다
+    LLM_CACHE.put(key, text)
+    return result
+
+
+def print_llm_stats():
+    """실행 끝에 캐시/재시도 통계 출력"""
+    if LLM_CACHE.hits or LLM_CACHE.misses:
+        print(LLM_CACHE.summary())
+    if LLM_CALLER.throttled:
+        print(f"⏳ 재시도(429·5xx·연결): {LLM_CALLER.throttled}회")
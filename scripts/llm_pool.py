@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""LLM 호출 동시 실행 + 속도 제한.
+
+- TokenBucket: 분당 요청 수(RPM) 제한, 여러 스레드가 공유
+- RateLimitedCaller: 버킷에서 토큰을 받은 뒤 호출, 429/529·5xx·연결 오류는 지수 백오프로 재시도
+  (SDK 클라이언트는 max_retries=0 — 재시도가 여기서만 일어나야 버킷을 거친다)
+- ordered_map: 스레드 풀로 동시에 실행하되 결과는 입력 순서대로 yield
+- completed_map: 같은 풀 실행, 결과는 끝난 순서대로 yield (앞쪽이 느려도 뒤쪽 결과를 바로 처리)
+
+SDK는 ANTHROPIC_BASE_URL / OPENAI_BASE_URL 환경변수를 따르므로, 로컬 가짜
+LLM 서버를 띄워 두고 그 주소를 넣으면 실제 API 없이 테스트할 수 있다.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+RETRY_STATUS = {408, 429, 500, 502, 503, 504, 529}
+# 상태 코드 없는 SDK 예외 중 재시도할 것 (anthropic/openai 공통 이름)
+RETRY_ERRORS = ("APIConnectionError", "APITimeoutError")
+
+
+def default_concurrency() -> int:
+    return max(1, int(os.getenv("LLM_CONCURRENCY", "4")))
+
+
+class TokenBucket:
+    """rate(초당 토큰)로 채워지고 capacity만큼 버스트를 허용하는 버킷."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def status_code(exc: BaseException) -> int | None:
+    """SDK 예외에서 HTTP 상태 코드 추출 (anthropic/openai 모두 status_code 사용)."""
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code
+
+
+def retryable(exc: BaseException) -> bool:
+    return status_code(exc) in RETRY_STATUS or type(exc).__name__ in RETRY_ERRORS
+
+
+def retry_after(exc: BaseException) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedCaller:
+    """버킷 + 재시도 백오프 (429·5xx·연결 오류)를 거쳐 함수를 호출한다."""
+
+    def __init__(self, rpm: float | None = None, retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 60.0):
+        if rpm is None:
+            rpm = float(os.getenv("LLM_RPM", "50"))
+        self.bucket = TokenBucket(rpm / 60.0, capacity=max(1.0, rpm / 60.0 * 5))
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.throttled = 0
+
+    def call(self, fn, *args, **kwargs):
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as exc:
+                if not retryable(exc) or attempt >= self.retries:
+                    raise
+                with self.bucket.lock:
+                    self.throttled += 1
+                delay = retry_after(exc)
+                if delay is None:
+                    delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                    delay += random.uniform(0, delay / 2)
+                time.sleep(delay)
+                attempt += 1
+
+
+def ordered_map(fn, items, workers: int = 4):
+    """fn(item)을 최대 workers개 동시에 실행하고 결과를 입력 순서대로 yield."""
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            # 앞쪽 결과를 기다리는 동안 큐가 무한정 쌓이지 않게 창 크기를 제한
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def completed_map(fn, items, workers: int = 4):
+    """fn(item)을 최대 workers개 동시에 실행하고 결과를 끝난 순서대로 yield."""
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for item in items:
+            pending.add(pool.submit(fn, item))
+            # ordered_map처럼 창 크기를 제한 — 하나라도 끝나면 그것부터 넘긴다
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Zotero 아이템 PDF 원문 추출 (PyMuPDF, 프로세스 풀, 파일 해시 캐시).
+
+PDF 찾는 순서:
+  1. 아이템의 attachments[].path / localPath (Better BibTeX JSON 등)
+  2. 아이템의 file 필드 ("경로1;경로2" 형식)
+  3. ~/ResearchOS/03_pdfs/ 안의 <citation-key 또는 id>.pdf, <제목>.pdf
+
+추출한 텍스트는 logs/.state/pdf_text/<sha1>.txt 로 저장한다. (경로, mtime, 크기)가
+같으면 해시도 다시 계산하지 않으므로, 바뀌지 않은 PDF는 열지도 않는다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from state_store import item_key
+
+try:
+    import pymupdf as fitz
+    HAS_PYMUPDF = True
+except ImportError:
+    try:
+        import fitz  # PyMuPDF < 1.24
+        HAS_PYMUPDF = True
+    except ImportError:
+        HAS_PYMUPDF = False
+
+BASE_DIR = Path.home() / "ResearchOS"
+PDF_DIR = BASE_DIR / "03_pdfs"
+TEXT_CACHE_DIR = BASE_DIR / "logs" / ".state" / "pdf_text"
+FILE_INDEX = TEXT_CACHE_DIR / "index.json"
+
+
+def _safe_name(text: str, max_len: int = 80) -> str:
+    # sync_and_analyze.safe_filename과 같은 규칙
+    clean = re.sub(r'[\\/*?:"<>|]', "", text)
+    return clean.strip().replace("  ", " ")[:max_len]
+
+
+def find_pdf(item: dict) -> Path | None:
+    candidates = []
+    for att in item.get("attachments", []) or []:
+        if isinstance(att, dict):
+            candidates.append(att.get("localPath") or att.get("path") or "")
+    if isinstance(item.get("file"), str):
+        candidates.extend(item["file"].split(";"))
+    for stem in (item.get("citation-key"), item.get("id"), _safe_name(item.get("title", ""))):
+        if stem:
+            candidates.append(str(PDF_DIR / f"{stem}.pdf"))
+
+    for raw in candidates:
+        raw = raw.strip()
+        if not raw.lower().endswith(".pdf"):
+            continue
+        path = Path(raw).expanduser()
+        if path.is_file():
+            return path
+    return None
+
+
+def pdf_signature(item: dict) -> str:
+    """아이템 PDF의 "경로:mtime_ns:크기" (PDF가 없으면 빈 문자열). PDF가 생기거나 바뀌면 달라진다."""
+    path = find_pdf(item)
+    if path is None:
+        return ""
+    st = path.stat()
+    return f"{path}:{st.st_mtime_ns}:{st.st_size}"
+
+
+def file_sha1(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _extract(path: str) -> str:
+    """워커 프로세스: PDF → 페이지별 텍스트 (페이지 사이는 \\f)."""
+    with fitz.open(path) as doc:
+        return "\f".join(page.get_text() for page in doc)
+
+
+def _load_index() -> dict:
+    if FILE_INDEX.exists():
+        try:
+            return json.loads(FILE_INDEX.read_text(encoding="utf-8"))
+        except ValueError:
+            return {}
+    return {}
+
+
+def extract_fulltexts(items, workers: int | None = None) -> dict[str, tuple[Path, str]]:
+    """{id 또는 제목: (pdf 경로, 원문)} — PDF가 없거나 추출 실패한 아이템은 빠진다."""
+    if not HAS_PYMUPDF:
+        return {}
+    TEXT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    index = _load_index()
+
+    found: dict[str, tuple[Path, str]] = {}
+    todo: dict[str, list[tuple[str, Path]]] = {}
+    for item in items:
+        path = find_pdf(item)
+        if path is None:
+            continue
+        key = item_key(item)
+        st = path.stat()
+        sig = [st.st_mtime_ns, st.st_size]
+        entry = index.get(str(path))
+        if entry and entry["sig"] == sig:
+            digest = entry["sha1"]
+        else:
+            digest = file_sha1(path)
+            index[str(path)] = {"sig": sig, "sha1": digest}
+        cached = TEXT_CACHE_DIR / f"{digest}.txt"
+        if cached.exists():
+            found[key] = (path, cached.read_text(encoding="utf-8"))
+        else:
+            todo.setdefault(digest, []).append((key, path))
+
+    if todo:
+        digests = list(todo)
+        paths = [str(todo[d][0][1]) for d in digests]
+        with ProcessPoolExecutor(max_workers=min(len(paths), workers or os.cpu_count() or 1)) as pool:
+            results = pool.map(_extract_safe, paths)
+            for digest, text in zip(digests, results):
+                if text is None:
+                    continue
+                (TEXT_CACHE_DIR / f"{digest}.txt").write_text(text, encoding="utf-8")
+                for key, path in todo[digest]:
+                    found[key] = (path, text)
+
+    FILE_INDEX.write_text(json.dumps(index), encoding="utf-8")
+    return found
+
+
+def _extract_safe(path: str) -> str | None:
+    try:
+        return _extract(path)
+    except Exception:
+        return None
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""배치 관련성 점수 — TF-IDF 코사인 (NumPy 벡터화) / 로컬 임베딩.
+
+calculate_relevance, rule_based_screen처럼 논문을 하나씩 부분 문자열로 세지 않고,
+라이브러리나 CSV 전체를 한 번에 토큰화해 문서 × 용어 희소 행렬(CSR)을 만든 뒤
+연구 프로필 키워드 벡터와의 코사인을 한 번에 계산한다.
+
+  tfidf      sublinear tf × smooth idf, L2 정규화 코사인.
+             NumPy가 있으면 행렬 연산으로, 없으면 같은 식을 순수 파이썬으로 계산한다.
+  embedding  sentence-transformers 모델로 CPU에서 임베딩한 코사인 (선택 설치).
+             모델: EMBEDDING_MODEL 환경변수 (기본 all-MiniLM-L6-v2)
+
+점수는 0~1 코사인이다 — 키워드 점수(calculate_relevance, 0~100)와 눈금이 다르고, 키워드 묶음과
+초록의 코사인은 대체로 0.3 아래다. 등급 기준은 ai_screener.VECTOR_LEVELS, 카드에는 × 100에
+relevance_scorer 표시. 토큰은 유니코드 문자/숫자 연속(casefold)이라 한글 키워드도 매칭된다.
+idf는 점수를 매길 문서들 자체 또는 따로 흘려 센 DocumentFrequency(라이브러리 전체 등) 기준이다.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+from collections import Counter
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    HAS_EMBEDDINGS = True
+except ImportError:
+    HAS_EMBEDDINGS = False
+
+SCORERS = ("tfidf", "embedding")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_BATCH = 64
+
+# 유니코드 문자/숫자 연속 (dedup_index._WORD와 같은 규칙) — 한글·악센트 문자도 용어가 된다
+_WORD = re.compile(r"[^\W_]+")
+# 같은 규칙의 빠른 경로: ASCII 영문자/숫자만 남기고(소문자로) 나머지 ASCII는 공백, 비ASCII 바이트는
+# 그대로 — bytes.translate + split이 정규식 findall보다 몇 배 빠르다. 비ASCII가 섞인 토큰만 _WORD로 다시 자른다.
+_TABLE = bytes(
+    c if 97 <= c <= 122 or 48 <= c <= 57 or c >= 128 else c + 32 if 65 <= c <= 90 else 32
+    for c in range(256)
+)
+STOPWORDS = frozenset(
+    "an and are as at be been but by for from had has have in into is it its not of on or "
+    "than that the their these this those to was were which with".split()
+)
+
+
+def _is_noise(term: str) -> bool:
+    # 영문 한 글자, 숫자로 시작하는 토큰(연도, 통계값), 불용어. 한글은 한 글자도 단어다 (삶, 뜻)
+    return (len(term) < 2 and term.isascii()) or term[0].isdigit() or term in STOPWORDS
+
+
+def term_counts(text: str) -> Counter:
+    """텍스트 → 용어 빈도 (casefold). 불용어 등도 남아 있다 (TermMatrix가 idf 0으로 처리)."""
+    counts = Counter(text.encode("utf-8", "ignore").translate(_TABLE).decode().split())
+    if not text.isascii():
+        for token in [token for token in counts if not token.isascii()]:
+            n = counts.pop(token)
+            for term in _WORD.findall(token.casefold()):
+                counts[term] += n
+    return counts
+
+
+class DocumentFrequency:
+    """idf 기준 문서 집합의 용어별 문서 수. 문서를 하나씩 흘려 보내며 세므로 행렬을 들고 있지 않는다."""
+
+    def __init__(self):
+        self.n_docs = 0
+        self.df: Counter = Counter()
+
+    def add(self, text: str) -> None:
+        self.n_docs += 1
+        self.df.update(term_counts(text).keys())
+
+
+class TermMatrix:
+    """문서 × 용어 빈도 행렬 (CSR: indptr, indices, counts)."""
+
+    def __init__(self, texts):
+        vocab: dict[str, int] = {}
+        setdefault = vocab.setdefault
+        indptr = [0]
+        indices: list[int] = []
+        counts: list[int] = []
+        for text in texts:
+            tf = term_counts(text)
+            # setdefault의 기본값은 삽입 전 크기이므로 새 용어는 다음 번호를 받는다
+            indices.extend([setdefault(term, len(vocab)) for term in tf])
+            counts.extend(tf.values())
+            indptr.append(len(indices))
+        self.vocab = vocab
+        self.indptr = indptr
+        self.indices = indices
+        self.counts = counts
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def noise_ids(self) -> list[int]:
+        # 문서마다 걸러내는 대신 용어 사전에서 한 번만 골라 가중치를 0으로 만든다
+        return [j for term, j in self.vocab.items() if _is_noise(term)]
+
+    def cosine(self, query: Counter, corpus: DocumentFrequency | None = None) -> list[float]:
+        """각 문서의 TF-IDF 벡터와 query(용어 → 빈도) 벡터의 코사인. corpus가 없으면 idf는 이 문서들 기준."""
+        if HAS_NUMPY:
+            return self._cosine_numpy(query, corpus)
+        return self._cosine_python(query, corpus)
+
+    def _cosine_numpy(self, query: Counter, corpus: DocumentFrequency | None) -> list[float]:
+        n_docs, n_terms = len(self), len(self.vocab)
+        if not n_docs:
+            return []
+        indices = np.asarray(self.indices, dtype=np.int64)
+        rows = np.repeat(np.arange(n_docs), np.diff(np.asarray(self.indptr, dtype=np.int64)))
+        if corpus is None:
+            n, df = n_docs, np.bincount(indices, minlength=n_terms)
+        else:
+            n, df = corpus.n_docs, np.fromiter(map(corpus.df.__getitem__, self.vocab), np.float64, n_terms)
+        idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+        idf[self.noise_ids()] = 0.0
+        weights = (1.0 + np.log(np.asarray(self.counts, dtype=np.float64))) * idf[indices]
+
+        q = np.zeros(n_terms)
+        for term, n in query.items():
+            j = self.vocab.get(term)
+            if j is not None:
+                q[j] = (1.0 + math.log(n)) * idf[j]
+        q_norm = np.sqrt(q @ q)
+        if not q_norm:
+            return [0.0] * n_docs
+
+        dot = np.bincount(rows, weights=weights * q[indices], minlength=n_docs)
+        norm = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n_docs))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = np.where(norm > 0, dot / (norm * q_norm), 0.0)
+        return scores.tolist()
+
+    def _cosine_python(self, query: Counter, corpus: DocumentFrequency | None) -> list[float]:
+        n_docs = len(self)
+        if not n_docs:
+            return []
+        if corpus is None:
+            n_base, df = n_docs, [0] * len(self.vocab)
+            for j in self.indices:
+                df[j] += 1
+        else:
+            n_base, df = corpus.n_docs, [corpus.df[term] for term in self.vocab]
+        idf = [math.log((1.0 + n_base) / (1.0 + n)) + 1.0 for n in df]
+        for j in self.noise_ids():
+            idf[j] = 0.0
+        q = {}
+        for term, n in query.items():
+            j = self.vocab.get(term)
+            if j is not None:
+                q[j] = (1.0 + math.log(n)) * idf[j]
+        q_norm = math.sqrt(sum(w * w for w in q.values()))
+        if not q_norm:
+            return [0.0] * n_docs
+
+        log, sqrt, q_get = math.log, math.sqrt, q.get
+        indptr, indices, counts = self.indptr, self.indices, self.counts
+        scores = []
+        for start, end in zip(indptr, indptr[1:]):
+            dot = norm = 0.0
+            for j, n in zip(indices[start:end], counts[start:end]):
+                w = (1.0 + log(n)) * idf[j]
+                norm += w * w
+                qw = q_get(j)
+                if qw:
+                    dot += w * qw
+            scores.append(dot / (sqrt(norm) * q_norm) if dot else 0.0)
+        return scores
+
+
+def query_vector(keywords) -> Counter:
+    """연구 키워드 목록 → 용어 빈도 (여러 단어 키워드는 단어마다 한 번씩)"""
+    query = Counter()
+    for keyword in keywords:
+        query.update(term for term in term_counts(keyword) if not _is_noise(term))
+    return query
+
+
+def tfidf_scores(texts, keywords, corpus: DocumentFrequency | None = None) -> list[float]:
+    return TermMatrix(texts).cosine(query_vector(keywords), corpus)
+
+
+_model = None
+
+
+def embedding_scores(texts, keywords) -> list[float]:
+    global _model
+    if not HAS_EMBEDDINGS:
+        raise RuntimeError("sentence-transformers 미설치 (pip install sentence-transformers)")
+    if _model is None:
+        _model = SentenceTransformer(EMBEDDING_MODEL, device="cpu")
+    texts = list(texts)
+    if not texts:
+        return []
+    docs = _model.encode(texts, batch_size=EMBEDDING_BATCH, normalize_embeddings=True, convert_to_numpy=True)
+    query = _model.encode(["; ".join(keywords)], normalize_embeddings=True, convert_to_numpy=True)[0]
+    return np.clip(docs @ query, 0.0, 1.0).tolist()
+
+
+def batch_scores(texts, keywords, method: str = "tfidf",
+                 corpus: DocumentFrequency | None = None) -> list[float]:
+    """texts 전체를 한 번에 점수화 (0~1, 입력 순서 그대로). corpus는 tfidf의 idf 기준 (임베딩은 무시)."""
+    if method == "tfidf":
+        return tfidf_scores(texts, keywords, corpus)
+    if method == "embedding":
+        return embedding_scores(texts, keywords)
+    raise ValueError(f"알 수 없는 scorer: {method} (가능: {', '.join(SCORERS)})")
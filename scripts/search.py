@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""카드 전문 검색 — SQLite FTS5 역색인 + BM25.
+
+02_cards_basic의 카드마다 제목 / 초록 / 태그 / 메모(내 메모, 연결점, 핵심 주장,
+주요 발견, 한계점)를 logs/.state/card_search.sqlite3 의 FTS5 테이블에 넣어 둔다.
+카드별 (mtime, 크기)를 기억해 두고 바뀐 카드만 다시 색인한다.
+순위는 FTS5 내장 bm25() — 제목 3 · 태그 2 · 초록 1 · 메모 1 가중치.
+
+사용법:
+  python3 search.py "meaning in life"              # 상위 10편
+  python3 search.py "art therapy" anxiety -n 20    # 검색어 여러 개는 OR (많이 맞을수록 위)
+  python3 search.py "therap*"                      # 접두어 검색
+  python3 search.py --rebuild cbt                  # 색인을 처음부터 다시
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from card_model import extract_section_text, map_cards, parse_card_text
+
+BASE_DIR = Path.home() / "ResearchOS"
+CARDS_DIR = BASE_DIR / "02_cards_basic"
+SEARCH_DB = BASE_DIR / "logs" / ".state" / "card_search.sqlite3"
+
+NOTE_SECTIONS = ("📝 내 메모", "🔗 내 연구와의 연결점", "🎯 핵심 주장", "💡 주요 발견", "⚠️ 한계점")
+RANK = "bm25(3.0, 1.0, 2.0, 1.0)"  # title, abstract, tags, notes
+
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_WORD = re.compile(r"\w+")
+
+
+class SearchHit(NamedTuple):
+    name: str       # 카드 파일명 ("제목.md")
+    score: float    # BM25 (클수록 관련)
+    snippet: str = ""
+
+
+def card_fields(path: Path) -> tuple[str, str, str, str]:
+    """카드 → (제목, 초록, 태그, 메모). map_cards 워커에서도 돈다."""
+    text = path.read_text(encoding="utf-8", errors="replace")
+    meta = parse_card_text(text, path.stem)
+    notes = "\n".join(extract_section_text(text, heading) for heading in NOTE_SECTIONS)
+    return (
+        str(meta.title),
+        extract_section_text(text, "Abstract"),
+        " ".join(meta.tags),
+        _COMMENT.sub("", notes).strip(),
+    )
+
+
+def match_query(terms) -> str:
+    """검색어 목록 → FTS5 MATCH 식.
+
+    각 검색어는 따옴표로 감싼 구(phrase)가 되므로 AND/NOT/column: 같은 FTS 문법으로
+    해석되지 않는다. 끝에 *가 붙은 검색어는 접두어 검색. 검색어끼리는 OR.
+    """
+    parts = []
+    for term in terms:
+        words = _WORD.findall(term)
+        if not words:
+            continue
+        phrase = '"' + " ".join(words) + '"'
+        parts.append(phrase + "*" if term.rstrip().endswith("*") else phrase)
+    return " OR ".join(parts)
+
+
+class CardSearchIndex:
+    def __init__(self, path: Path = SEARCH_DB):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE,
+                sig TEXT NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts USING fts5(
+                title, abstract, tags, notes,
+                tokenize = 'porter unicode61 remove_diacritics 2'
+            );
+            """
+        )
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def clear(self) -> None:
+        self.conn.execute("DELETE FROM docs")
+        self.conn.execute("DELETE FROM cards_fts")
+        self.conn.commit()
+
+    def refresh(self, cards_dir: Path = CARDS_DIR, names=None, jobs: int | None = None) -> int:
+        """카드 폴더와 맞춘다. names를 주면 그 파일들만 확인한다. 반환값: 바뀐 카드 수."""
+        known = dict(self.conn.execute("SELECT name, sig FROM docs"))
+        current = {}
+        if names is None:
+            with os.scandir(cards_dir) as it:
+                for e in it:
+                    if e.name.endswith(".md") and not e.name.startswith(".") and e.is_file():
+                        st = e.stat()
+                        current[e.name] = f"{st.st_mtime_ns}:{st.st_size}"
+            removed = [name for name in known if name not in current]
+        else:
+            removed = []
+            for name in names:
+                try:
+                    st = (cards_dir / name).stat()
+                except FileNotFoundError:
+                    if name in known:
+                        removed.append(name)
+                    continue
+                current[name] = f"{st.st_mtime_ns}:{st.st_size}"
+
+        changed = [name for name, sig in current.items() if known.get(name) != sig]
+        fields = map_cards(card_fields, [cards_dir / name for name in changed], jobs=jobs)
+
+        with self.conn:
+            for name in removed:
+                self._delete(name)
+            for name, row in zip(changed, fields):
+                self._delete(name)
+                cur = self.conn.execute("INSERT INTO docs (name, sig) VALUES (?, ?)", (name, current[name]))
+                self.conn.execute(
+                    "INSERT INTO cards_fts (rowid, title, abstract, tags, notes) VALUES (?, ?, ?, ?, ?)",
+                    (cur.lastrowid, *row),
+                )
+        return len(removed) + len(changed)
+
+    def _delete(self, name: str) -> None:
+        row = self.conn.execute("SELECT id FROM docs WHERE name = ?", (name,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM cards_fts WHERE rowid = ?", row)
+            self.conn.execute("DELETE FROM docs WHERE id = ?", row)
+
+    def search(self, terms, limit: int = 10, snippets: bool = False, columns=None) -> list[SearchHit]:
+        """BM25 상위 limit편. terms는 검색어 목록 (문자열 하나면 공백으로 나눈다).
+
+        columns를 주면 그 열(title/abstract/tags/notes)에서만 찾는다.
+        """
+        if isinstance(terms, str):
+            terms = terms.split()
+        query = match_query(terms)
+        if not query:
+            return []
+        if columns:
+            query = "{" + " ".join(columns) + "}: (" + query + ")"
+        rows = self.conn.execute(
+            f"""
+            SELECT cards_fts.rowid, d.name, -rank
+            FROM cards_fts JOIN docs d ON d.id = cards_fts.rowid
+            WHERE cards_fts MATCH ? AND rank MATCH '{RANK}'
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (query, limit),
+        ).fetchall()
+        if not snippets or not rows:
+            return [SearchHit(name, score) for _, name, score in rows]
+
+        # snippet()은 비싸서 상위 결과에만 계산한다
+        marks = ",".join("?" * len(rows))
+        snippet_of = dict(self.conn.execute(
+            f"""
+            SELECT rowid, snippet(cards_fts, -1, '**', '**', '…', 16)
+            FROM cards_fts WHERE cards_fts MATCH ? AND rowid IN ({marks})
+            """,
+            (query, *[r[0] for r in rows]),
+        ))
+        return [SearchHit(name, score, snippet_of.get(rowid, "")) for rowid, name, score in rows]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="카드 전문 검색 (BM25)")
+    parser.add_argument("query", nargs="+", help='검색어 (여러 개는 OR, 구는 따옴표: "art therapy")')
+    parser.add_argument("-n", "--limit", type=int, default=10, help="보여줄 결과 수 (기본 10)")
+    parser.add_argument("--rebuild", action="store_true", help="색인을 지우고 처음부터 다시 만든다")
+    parser.add_argument("--jobs", type=int, default=None, help="색인 시 카드 로딩 프로세스 수")
+    args = parser.parse_args()
+
+    index = CardSearchIndex()
+    if args.rebuild:
+        index.clear()
+    start = time.perf_counter()
+    changed = index.refresh(CARDS_DIR, jobs=args.jobs)
+    if changed:
+        print(f"🗂️ 색인 갱신: {changed}편 ({time.perf_counter() - start:.2f}s, 전체 {len(index)}편)")
+
+    start = time.perf_counter()
+    hits = index.search(args.query, limit=args.limit, snippets=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    index.close()
+
+    if not hits:
+        print(f"🔎 결과 없음 ({elapsed:.1f}ms)")
+        return
+    print(f"🔎 상위 {len(hits)}편 ({elapsed:.1f}ms)\n")
+    for i, hit in enumerate(hits, 1):
+        print(f"{i:>3}. [[02_cards_basic/{Path(hit.name).stem}]]  ({hit.score:.2f})")
+        if hit.snippet:
+            print(f"     {' '.join(hit.snippet.split())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Zotero 아이템별 처리 상태 저장소 (SQLite, logs/.state 아래).
+
+Zotero ``id`` 를 키로 아이템 내용 해시와 산출물(카드 파일명 등)을 기록해 두고,
+다음 실행에서 library.json과 비교해 추가/변경된 아이템만 골라낸다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+STATE_DIR = Path.home() / "ResearchOS" / "logs" / ".state"
+
+# 카드 내용과 무관하게 export마다 바뀌는 필드는 해시에서 뺀다.
+VOLATILE_FIELDS = ("accessed",)
+
+
+def item_key(item: dict) -> str:
+    """아이템 식별자: Zotero id, 없으면 제목."""
+    return str(item.get("id") or item.get("title") or "")
+
+
+def item_hash(item: dict) -> str:
+    """메타데이터 내용 해시 (키 순서와 무관)."""
+    stable = {k: v for k, v in item.items() if k not in VOLATILE_FIELDS}
+    raw = json.dumps(stable, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ItemStateStore:
+    """key → (content_hash, target) 테이블 하나를 감싼 작은 저장소."""
+
+    def __init__(self, path: Path, table: str = "items"):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.table = table
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY,"
+            " content_hash TEXT NOT NULL,"
+            " target TEXT NOT NULL DEFAULT '',"
+            " updated_at TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def snapshot(self) -> dict[str, tuple[str, str]]:
+        """전체 상태 {key: (content_hash, target)}"""
+        rows = self.conn.execute(f"SELECT key, content_hash, target FROM {self.table}")
+        return {key: (h, target) for key, h, target in rows}
+
+    def get(self, key: str) -> tuple[str, str] | None:
+        return self.conn.execute(
+            f"SELECT content_hash, target FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+
+    def get_many(self, keys) -> dict[str, tuple[str, str]]:
+        """keys 중 상태가 있는 것만 {key: (content_hash, target)} (한 번의 IN 조회)"""
+        keys = list(keys)
+        if not keys:
+            return {}
+        rows = self.conn.execute(
+            f"SELECT key, content_hash, target FROM {self.table}"
+            f" WHERE key IN ({','.join('?' * len(keys))})",
+            keys,
+        )
+        return {key: (h, target) for key, h, target in rows}
+
+    def put(self, key: str, content_hash: str, target: str = "", commit: bool = True) -> None:
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, content_hash, target, updated_at)"
+            " VALUES (?, ?, ?, ?)",
+            (key, content_hash, target, datetime.now().isoformat(timespec="seconds")),
+        )
+        if commit:
+            self.conn.commit()
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+
+def diff_items(items, state: dict[str, tuple[str, str]], stale=None):
+    """state와 비교해 (item, key, hash, 이전 target 또는 None) 중 바뀐 것만 yield.
+
+    이전 target이 None이면 새 아이템, 문자열이면 내용이 바뀐 아이템이다.
+    stale(item, key)가 True인 아이템은 내용 해시가 같아도 바뀐 것으로 본다 (예: PDF 교체).
+    """
+    for item in items:
+        key = item_key(item)
+        if not key:
+            continue
+        h = item_hash(item)
+        prev = state.get(key)
+        if prev is None:
+            yield item, key, h, None
+        elif prev[0] != h or (stale is not None and stale(item, key)):
+            yield item, key, h, prev[1]
@@ -7,18 +7,29 @@ Zotero → 리서치 카드 자동 생성
   python3 sync_and_analyze.py --write             # 기본 (메타데이터만, 무료)
   python3 sync_and_analyze.py --write --ai        # AI 분석 포함 (API 비용)
   python3 sync_and_analyze.py --write --ai --limit 5
+  python3 sync_and_analyze.py --write --ai --concurrency 8   # 동시 요청 수 (기본: LLM_CONCURRENCY=4)
+  python3 sync_and_analyze.py --write --ai --batch            # 배치 API로 제출, 끝난 뒤 다시 실행하면 카드 생성
+  python3 sync_and_analyze.py --write --ai --batch --wait     # 배치가 끝날 때까지 폴링
+  python3 sync_and_analyze.py --write --fulltext [--jobs 4]   # PDF 원문을 관련성/AI 분석에 사용 (PyMuPDF, PDF가 생기거나 바뀐 카드도 재생성)
+  python3 sync_and_analyze.py --write --scorer tfidf          # 관련성을 라이브러리 전체 TF-IDF 코사인으로 (embedding도 가능)
 """
 
-import json, os, sys, re, time
+import json, sys, re
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
 from dotenv import load_dotenv
 
-try:
-    import fitz
-    HAS_PYMUPDF = True
-except ImportError:
-    HAS_PYMUPDF = False
+from card_model import extract_section_text, parse_card_text
+from keyword_matcher import KeywordMatcher
+from llm_client import LLM_PROVIDER, call_llm, llm_sdk_available, print_llm_stats
+from llm_batch import prepare_batch
+from llm_pool import default_concurrency, ordered_map
+from pdf_text import HAS_PYMUPDF, extract_fulltexts, pdf_signature
+from relevance_engine import HAS_EMBEDDINGS, SCORERS, DocumentFrequency, batch_scores
+from state_store import ItemStateStore, diff_items, item_key
+from zotero_stream import LibraryStream
 
 load_dotenv(Path.home() / "ResearchOS" / "secrets" / ".env")
 
@@ -26,11 +37,12 @@ ZOTERO_JSON = Path.home() / "ResearchOS" / "01_zotero_export" / "library.json"
 CARDS_DIR   = Path.home() / "ResearchOS" / "02_cards_basic"
 LOG_DIR     = Path.home() / "ResearchOS" / "logs"
 RESEARCH_PROFILE = Path.home() / "ResearchOS" / "MY_RESEARCH.md"
+CARD_STATE_DB = LOG_DIR / ".state" / "cards.sqlite3"  # cards: 메타데이터 해시, card_pdfs: 원문을 뽑은 PDF 서명
+FULLTEXT_CHARS = 12000
 
 CARDS_DIR.mkdir(parents=True, exist_ok=True)
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
-LLM_PROVIDER = os.getenv("LLM_PROVIDER", "claude").lower()
 DEFAULT_RESEARCH_KEYWORDS = [
     "anxiety", "depression", "mood", "cbt", "act", "mindfulness",
     "automation", "artificial intelligence", "technological unemployment",
@@ -70,11 +82,9 @@ def categorize_tags(keywords):
         if not matched: cats['other'].append(kw)
     return cats
 
-def load_research_keywords():
-    path = Path.home() / "ResearchOS" / "MY_RESEARCH.md"
-    if not path.exists():
-        return DEFAULT_RESEARCH_KEYWORDS
-    content = path.read_text(encoding='utf-8').lower()
+def parse_research_keywords(content):
+    """MY_RESEARCH.md 본문 → 연구 키워드 목록"""
+    content = content.lower()
     keywords = set(DEFAULT_RESEARCH_KEYWORDS)
     for line in content.split('\n'):
         line = line.strip()
@@ -92,22 +102,72 @@ def load_research_keywords():
                         keywords.add(sub.lower())
     return sorted(keywords)
 
-def calculate_relevance(item, research_keywords):
+def _profile_mtime(path):
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+class ResearchProfile:
+    """실행당 한 번 읽는 연구 프로필: 원문, 키워드, 컴파일된 매처"""
+    __slots__ = ('path', 'mtime', 'text', 'keywords', 'matcher')
+
+    def __init__(self, path=RESEARCH_PROFILE):
+        self.path = path
+        self.mtime = _profile_mtime(path)
+        if self.mtime is None:
+            self.text = ""
+            self.keywords = list(DEFAULT_RESEARCH_KEYWORDS)
+        else:
+            self.text = path.read_text(encoding='utf-8')
+            self.keywords = parse_research_keywords(self.text)
+        self.matcher = KeywordMatcher(self.keywords)
+
+    def is_stale(self):
+        return _profile_mtime(self.path) != self.mtime
+
+_profile = None
+
+def get_research_profile():
+    """현재 프로필 (MY_RESEARCH.md mtime이 바뀌면 다시 읽음 — watch 프로세스용)"""
+    global _profile
+    if _profile is None or _profile.is_stale():
+        _profile = ResearchProfile()
+    return _profile
+
+def load_research_keywords():
+    return list(get_research_profile().keywords)
+
+@lru_cache(maxsize=8)
+def _compiled_matcher(keywords):
+    return KeywordMatcher(keywords)
+
+def compile_research_keywords(research_keywords):
+    """키워드 목록/프로필 → KeywordMatcher (이미 컴파일된 경우 그대로)"""
+    if isinstance(research_keywords, ResearchProfile):
+        return research_keywords.matcher
+    if isinstance(research_keywords, KeywordMatcher):
+        return research_keywords
+    return _compiled_matcher(tuple(research_keywords))
+
+def calculate_relevance(item, research_keywords, fulltext=''):
     if not research_keywords:
         return 0
+    matcher = compile_research_keywords(research_keywords)
     title = item.get('title', '').lower()
     abstract = item.get('abstract', '').lower()
+    if fulltext:
+        # PDF 원문은 초록과 같은 가중치(1.5)로 취급
+        abstract = f"{abstract}\n{fulltext.lower()}"
     kws = [k.lower() for k in extract_keywords(item)]
     content = f"{title} {abstract} {' '.join(kws)}"
 
-    score = 0.0
-    for rk in research_keywords:
-        if rk in title:
-            score += 4
-        elif any(rk in k for k in kws):
-            score += 3
-        elif rk in abstract:
-            score += 1.5
+    # 필드마다 한 번씩만 스캔한다. 우선순위: title(4) > keyword(3) > abstract(1.5)
+    in_title = matcher.findall(title)
+    in_kws = matcher.findall('\x00'.join(kws)) - in_title
+    in_abstract = matcher.findall(abstract) - in_title - in_kws
+    score = (4 * matcher.weight(in_title) + 3 * matcher.weight(in_kws)
+             + 1.5 * matcher.weight(in_abstract))
 
     # Common evidence language receives a slight boost for methods-heavy papers.
     evidence_terms = ["meta-analysis", "systematic review", "randomized", "rct", "effect size"]
@@ -116,31 +176,36 @@ def calculate_relevance(item, research_keywords):
     tags = categorize_tags(extract_keywords(item))
     if tags.get('method'):
         score += 2
-    max_p = len(research_keywords) * 4 + 2
+    max_p = len(matcher) * 4 + 2
     if max_p <= 0:
         return 0
     return min(100, round((score / max_p) * 100, 1))
 
-def call_llm(prompt, system_prompt):
-    try:
-        if LLM_PROVIDER == "claude":
-            from anthropic import Anthropic
-            client = Anthropic()
-            r = client.messages.create(model="claude-sonnet-4-20250514", max_tokens=2000,
-                system=system_prompt, messages=[{"role":"user","content":prompt}])
-            return r.content[0].text
-        from openai import OpenAI
-        client = OpenAI()
-        r = client.chat.completions.create(model="gpt-4o-mini",
-            messages=[{"role":"system","content":system_prompt},{"role":"user","content":prompt}],
-            temperature=0.2, max_tokens=2000)
-        return r.choices[0].message.content
-    except ImportError as exc:
-        raise RuntimeError(
-            f"LLM SDK가 설치되지 않았습니다. provider={LLM_PROVIDER}"
-        ) from exc
-
-def ai_analyze(text, research_profile):
+def relevance_text(item, fulltext=''):
+    """배치 scorer 입력 텍스트. 제목은 두 번 넣어 키워드 방식의 제목 가중치를 흉내낸다."""
+    title = item.get('title', '')
+    keywords = ' '.join(extract_keywords(item))
+    return f"{title}\n{title}\n{keywords}\n{item.get('abstract', '')}\n{fulltext}"
+
+def library_relevance(items, profile, scorer, fulltexts=None, corpus=None):
+    """items(바뀐 아이템)를 한 번에 점수화 → {item_key: 코사인 × 100}. tfidf의 idf는 corpus(라이브러리 전체) 기준.
+
+    키워드 점수(calculate_relevance: 가능한 최고 점수 대비 %)와 눈금이 달라 코사인 0.3이면 30이다.
+    카드에는 relevance_scorer로 어느 방식의 점수인지 남긴다.
+    """
+    fulltexts = fulltexts or {}
+    keys, texts = [], []
+    for item in items:
+        key = item_key(item)
+        keys.append(key)
+        texts.append(relevance_text(item, fulltexts.get(key, (None, ''))[1]))
+    scores = batch_scores(texts, compile_research_keywords(profile).keywords, scorer, corpus)
+    return {key: round(score * 100, 1) for key, score in zip(keys, scores)}
+
+def analysis_prompt(text, research_profile, max_chars=4000):
+    """ai_analyze 프롬프트 → (prompt, system_prompt)"""
+    if isinstance(research_profile, ResearchProfile):
+        research_profile = research_profile.text
     system_prompt = "You are a psychology research assistant. Respond ONLY with valid JSON."
     prompt = f"""논문 분석 → JSON:
 
@@ -148,18 +213,36 @@ def ai_analyze(text, research_profile):
 {research_profile[:1500]}
 
 === 논문 텍스트 ===
-{text[:4000]}
+{text[:max_chars]}
 
 JSON:
 {{"key_claims":["주장1","주장2","주장3"],"main_finding":"한줄요약","method_type":"RCT/meta/survey/etc","sample_size":"N=?","population":"대상","design":"between/within/etc","measurement_tools":"도구","effect_size":"효과크기","limitations":"한계","relevance_to_my_research":"연결점 2문장","reading_priority":"must-read/should-read/reference-only","priority_reason":"이유","suggested_topic_tags":["tag1","tag2"]}}"""
+    return prompt, system_prompt
+
+def parse_analysis(raw):
+    """ai_analyze 응답 → dict (JSON 객체가 아니면 예외 — call_llm이 캐시에 남기지 않는다)"""
+    cleaned = re.sub(r'^```\w*\n?|```$', '', raw.strip())
+    data = json.loads(cleaned)
+    if not isinstance(data, dict):
+        raise ValueError("분석 응답이 JSON 객체가 아님")
+    return data
+
+def ai_analyze(text, research_profile, max_chars=4000):
+    prompt, system_prompt = analysis_prompt(text, research_profile, max_chars)
     try:
-        raw = call_llm(prompt, system_prompt)
-        cleaned = re.sub(r'^```\w*\n?|```$', '', raw.strip())
-        return json.loads(cleaned)
+        return call_llm(prompt, system_prompt, parse=parse_analysis)
     except Exception:
         return None
 
-def make_card(item, ai_data=None):
+def analysis_input(item, fulltext=''):
+    """AI 분석에 넘길 텍스트와 길이 제한 (원문이 있으면 초록 + 원문 앞부분)"""
+    abstract = item.get('abstract', '')
+    if not fulltext:
+        return abstract, 4000
+    return f"{abstract}\n\n=== 본문 ===\n{fulltext}", FULLTEXT_CHARS
+
+def make_card(item, ai_data=None, profile=None, fulltext='', pdf_path=None, relevance_score=None,
+              relevance_scorer=None):
     title = item.get('title', 'Untitled')
     authors = extract_authors(item)
     year = extract_year(item)
@@ -186,8 +269,8 @@ def make_card(item, ai_data=None):
         for t in ai_data.get('suggested_topic_tags', []):
             if f"topic:{t}" not in keywords: keywords.append(f"topic:{t}")
     
-    rk = load_research_keywords()
-    relevance_score = calculate_relevance(item, rk)
+    if relevance_score is None:
+        relevance_score = calculate_relevance(item, profile or get_research_profile(), fulltext)
     p_emoji = {'must-read':'🔴','should-read':'🟡','reference-only':'⚪','to-read':'📘'}.get(reading_priority,'📘')
 
     lines = ['---']
@@ -205,11 +288,13 @@ def make_card(item, ai_data=None):
     lines.append(f'measurement: "{measurement}"')
     lines.append(f'effect_size: "{effect_size}"')
     lines.append(f'relevance_score: {relevance_score}')
+    if relevance_scorer: lines.append(f'relevance_scorer: "{relevance_scorer}"')
     lines.append(f'reading_priority: "{reading_priority}"')
     if keywords:
         lines.append('tags:')
         for k in keywords: lines.append(f'  - "{k}"')
     lines.append(f'zotero_key: "{item.get("id","")}"')
+    if pdf_path: lines.append(f'pdf: "{pdf_path}"')
     lines.append(f'card_type: quickcard')
     lines.append(f'created: "{datetime.now().strftime("%Y-%m-%d")}"')
     lines.append(f'source: "{"ai-analyzed" if ai_data else "metadata-only"}"')
@@ -221,7 +306,8 @@ def make_card(item, ai_data=None):
     lines.append(f'**Year:** {year}')
     if journal: lines.append(f'**Journal:** {journal}')
     if doi: lines.append(f'**DOI:** https://doi.org/{doi}')
-    lines.append(f'**Relevance:** {relevance_score}/100\n')
+    scale = f' ({relevance_scorer} 코사인 × 100)' if relevance_scorer else ''
+    lines.append(f'**Relevance:** {relevance_score}/100{scale}\n')
     
     lines.append('## 📊 연구 분해\n')
     lines.append('| 항목 | 내용 |')
@@ -254,83 +340,258 @@ def make_card(item, ai_data=None):
     
     return '\n'.join(lines)
 
-def main():
-    write_mode = '--write' in sys.argv
-    ai_mode = '--ai' in sys.argv
+USER_SECTIONS = ('## 📝 내 메모', '## 🔗 Related')
+PLACEHOLDER = '<!-- 채우기 -->'
+# 연구 분해 표 행 → frontmatter 키
+BREAKDOWN_FIELDS = {'Method': 'method', 'N': 'sample_size', 'Population': 'population',
+                    'Design': 'design', 'Measurement': 'measurement', 'Effect Size': 'effect_size'}
+_BREAKDOWN_ROW = re.compile(r'^\| \*\*(.+?)\*\* \| (.*) \|$', re.M)
+_CREATED = re.compile(r'^created: .*$', re.M)
+_PRIORITY_REASON = re.compile(r'^.*\*\*Priority:\*\* .*\n> (.*)$', re.M)
+
+def _section_span(text, heading):
+    start = text.find(f'\n{heading}\n')
+    if start < 0: return None
+    end = text.find('\n## ', start + 1)
+    return start, (end if end >= 0 else len(text))
+
+def carry_over_notes(old_card, new_card, keep_breakdown=True):
+    """카드 재생성 시 기존 카드에서 유지할 것: 메모/Related 섹션, created 날짜, 연구 분해 표에 채워 둔 칸.
+
+    keep_breakdown=False(이번 실행에서 새로 AI 분석함)면 표는 새 값이 빈 칸인 행만 기존 값으로 채운다.
+    """
+    for heading in USER_SECTIONS:
+        old_span = _section_span(old_card, heading)
+        new_span = _section_span(new_card, heading)
+        if old_span and new_span:
+            new_card = new_card[:new_span[0]] + old_card[old_span[0]:old_span[1]] + new_card[new_span[1]:]
+
+    created = _CREATED.search(old_card)
+    if created:
+        new_card = _CREATED.sub(lambda _: created.group(0), new_card, count=1)
+
+    filled = {label: value for label, value in _BREAKDOWN_ROW.findall(old_card)
+              if label in BREAKDOWN_FIELDS and value.strip() and value != PLACEHOLDER}
+    kept = {}
+    def row(m):
+        label, value = m.groups()
+        if label not in filled or (value != PLACEHOLDER and not keep_breakdown):
+            return m.group(0)
+        kept[label] = filled[label]
+        return f'| **{label}** | {filled[label]} |'
+    new_card = _BREAKDOWN_ROW.sub(row, new_card)
+    # frontmatter도 표와 같은 값으로 (인덱스/검색은 frontmatter를 읽는다)
+    for label, value in kept.items():
+        key = BREAKDOWN_FIELDS[label]
+        new_card = re.sub(rf'^{key}: .*$', lambda _: f'{key}: "{value}"', new_card, count=1, flags=re.M)
+    return new_card
+
+def recover_ai_data(card):
+    """--ai 없이 재생성할 때 기존 AI 분석 카드에서 ai_data를 되살린다. AI 분석 카드가 아니면 None."""
+    meta = parse_card_text(card, '')
+    if meta.get('source') != 'ai-analyzed':
+        return None
+    claims = extract_section_text(card, '🎯 핵심 주장')
+    relevance = extract_section_text(card, '🔗 내 연구와의 연결점')
+    reason = _PRIORITY_REASON.search(card)
+    return {
+        'method_type': meta.get('method', ''),
+        'sample_size': meta.get('sample_size', ''),
+        'population': meta.get('population', ''),
+        'design': meta.get('design', ''),
+        'measurement_tools': meta.get('measurement', ''),
+        'effect_size': meta.get('effect_size', ''),
+        'reading_priority': meta.get('reading_priority', 'to-read'),
+        'priority_reason': reason.group(1) if reason else '',
+        'key_claims': [re.sub(r'^\d+\.\s*', '', c) for c in claims.splitlines() if c.strip()],
+        'main_finding': extract_section_text(card, '💡 주요 발견'),
+        'relevance_to_my_research': '' if relevance.startswith('<!--') else relevance,
+        'limitations': extract_section_text(card, '⚠️ 한계점'),
+        'suggested_topic_tags': [t[len('topic:'):] for t in meta.tags if t.startswith('topic:')],
+    }
+
+def main(argv=None):
+    """argv: 명령행 인자 (None이면 sys.argv). 반환값: 쓴(또는 DRY-RUN으로 보여준) 카드 파일명 목록."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    write_mode = '--write' in argv
+    ai_mode = '--ai' in argv
+    batch_mode = '--batch' in argv
+    fulltext_mode = '--fulltext' in argv
+    jobs = None
+    wait_mode = '--wait' in argv
     limit = None
-    for i, arg in enumerate(sys.argv):
-        if arg == '--limit' and i+1 < len(sys.argv):
+    scorer = None
+    concurrency = default_concurrency()
+    for i, arg in enumerate(argv):
+        if arg == '--limit' and i+1 < len(argv):
             try:
-                limit = int(sys.argv[i+1])
+                limit = int(argv[i+1])
             except ValueError:
                 print("⚠️ --limit 값이 숫자가 아닙니다. 전체를 처리합니다.")
                 limit = None
+        if arg == '--concurrency' and i+1 < len(argv):
+            try:
+                concurrency = max(1, int(argv[i+1]))
+            except ValueError:
+                print(f"⚠️ --concurrency 값이 숫자가 아닙니다. 기본값 {concurrency}을 사용합니다.")
+        if arg == '--jobs' and i+1 < len(argv):
+            try:
+                jobs = max(1, int(argv[i+1]))
+            except ValueError:
+                print("⚠️ --jobs 값이 숫자가 아닙니다. CPU 코어 수만큼 사용합니다.")
+        if arg == '--scorer' and i+1 < len(argv):
+            scorer = argv[i+1]
+    if scorer is not None and scorer not in SCORERS:
+        print(f"⚠️ --scorer 값은 {', '.join(SCORERS)} 중 하나입니다. 키워드 점수를 사용합니다.")
+        scorer = None
+    if scorer == 'embedding' and not HAS_EMBEDDINGS:
+        print("⚠️ sentence-transformers 미설치: tfidf로 대체합니다. (pip install sentence-transformers)")
+        scorer = 'tfidf'
     
     if not ZOTERO_JSON.exists():
         print(f"❌ {ZOTERO_JSON} 없음. Zotero Auto-Export 설정 확인."); sys.exit(1)
     
-    with open(ZOTERO_JSON, 'r', encoding='utf-8') as f: data = json.load(f)
-    items = data if isinstance(data, list) else data.get('items', [])
-    print(f"📚 Zotero: {len(items)}개")
-    
-    existing = {f.stem for f in CARDS_DIR.glob('*.md')}
-    rk = load_research_keywords()
-    
-    new_items = [(item, calculate_relevance(item, rk)) for item in items
-                 if safe_filename(item.get('title','Untitled')) not in existing
-                 and safe_filename(item.get('title','Untitled'))]
+    items = LibraryStream(ZOTERO_JSON)
+    state = ItemStateStore(CARD_STATE_DB, table="cards")
+    pdf_state = ItemStateStore(CARD_STATE_DB, table="card_pdfs")
+    profile = get_research_profile()
+    use_pdf = fulltext_mode and HAS_PYMUPDF
+
+    # 상태 DB와 비교해 추가/변경된 아이템만 골라낸다
+    snapshot = state.snapshot()
+    owners = {target: key for key, (_, target) in snapshot.items() if target}  # 카드 파일명 → 아이템 키
+    pdf_sigs = {key: sig for key, (sig, _) in pdf_state.snapshot().items()}
+
+    def pdf_stale(item, key):
+        # --fulltext: 메타데이터는 그대로여도 PDF가 새로 생겼거나 바뀐 카드는 다시 만든다
+        sig = pdf_signature(item)
+        return bool(sig) and pdf_sigs.get(key) != sig
+
+    corpus = DocumentFrequency() if scorer == 'tfidf' else None
+
+    def scanned(items):
+        # library.json은 한 번만 읽는다 — diff 하면서 tfidf idf용 문서 빈도도 센다
+        for item in items:
+            corpus.add(relevance_text(item))
+            yield item
+
+    changed, adopted = [], 0
+    for item, key, h, prev in diff_items(scanned(items) if corpus else items, snapshot,
+                                         stale=pdf_stale if use_pdf else None):
+        filename = safe_filename(item.get('title','Untitled'))
+        if not filename:
+            continue
+        if prev is None and filename not in owners and (CARDS_DIR / f"{filename}.md").exists():
+            # 상태 DB 도입 전에 만든 카드: 덮어쓰지 않고 현재 해시만 기록
+            if write_mode: state.put(key, h, filename, commit=False)
+            adopted += 1
+            continue
+        changed.append((item, key, h, prev))
+    state.commit()
+
+    # PDF 원문 추출 (바뀐 아이템과 PDF가 바뀐 아이템만, 프로세스 풀, 해시 캐시)
+    fulltexts = {}
+    if fulltext_mode:
+        if not HAS_PYMUPDF:
+            print("⚠️ PyMuPDF 미설치로 원문 추출을 건너뜁니다. (pip install pymupdf)")
+        elif changed:
+            fulltexts = extract_fulltexts([c[0] for c in changed], workers=jobs)
+            print(f"📄 PDF 원문: {len(fulltexts)}/{len(changed)}편")
+
+    if scorer and changed:
+        scores = library_relevance([c[0] for c in changed], profile, scorer, fulltexts, corpus)
+        new_items = [(item, scores[key], key, h, prev) for item, key, h, prev in changed]
+    else:
+        new_items = [(item, calculate_relevance(item, profile, fulltexts.get(key, (None, ''))[1]), key, h, prev)
+                     for item, key, h, prev in changed]
     new_items.sort(key=lambda x: x[1], reverse=True)
-    
-    print(f"🆕 새 카드: {len(new_items)}개 (기존: {len(existing)}개)")
+    n_updated = sum(1 for x in new_items if x[4] is not None)
+
+    print(f"📚 Zotero: {items.count}개")
+    print(f"🆕 새 카드: {len(new_items) - n_updated}개 | ✏️ 변경: {n_updated}개 (추적 중: {len(state)}개)")
+    if adopted:
+        print(f"📎 기존 카드 {adopted}개를 상태 DB에 등록{'' if write_mode else ' (DRY-RUN: 저장 안 함)'}")
     if limit: new_items = new_items[:limit]
     if ai_mode:
-        sdk_ok = True
-        if LLM_PROVIDER == "claude":
-            try:
-                import anthropic  # noqa: F401
-            except ImportError:
-                sdk_ok = False
-        else:
-            try:
-                import openai  # noqa: F401
-            except ImportError:
-                sdk_ok = False
-        if not sdk_ok:
+        if not llm_sdk_available():
             print(f"⚠️ {LLM_PROVIDER} SDK 미설치로 AI 분석을 건너뜁니다. (metadata-only 모드)")
             ai_mode = False
         else:
-            print(f"🤖 AI 모드 | 💰 ~${len(new_items)*0.02:.2f}")
+            print(f"🤖 AI 모드 | 동시 요청 {concurrency}개 | 💰 ~${len(new_items)*0.02:.2f}")
     
-    rp = RESEARCH_PROFILE.read_text(encoding='utf-8') if RESEARCH_PROFILE.exists() else ""
     created = []
+
+    if write_mode and ai_mode and batch_mode:
+        prompts = []
+        for item, _, key, _, _ in new_items:
+            text, max_chars = analysis_input(item, fulltexts.get(key, (None, ''))[1])
+            if text:
+                prompts.append(analysis_prompt(text, profile, max_chars))
+        if not prepare_batch("cards", prompts, wait=wait_mode):
+            state.close()
+            pdf_state.close()
+            return created
+
+    def analyze(entry):
+        text, max_chars = analysis_input(entry[0], fulltexts.get(entry[2], (None, ''))[1])
+        return ai_analyze(text, profile, max_chars) if text else None
+
+    # AI 분석은 동시에 돌리고, 카드는 new_items 순서대로 쓴다.
+    if write_mode and ai_mode:
+        analyses = ordered_map(analyze, new_items, workers=concurrency)
+    else:
+        analyses = repeat(None)
     
-    for i, (item, rel) in enumerate(new_items):
+    for (item, rel, key, h, prev), ai_data in zip(new_items, analyses):
         title = item.get('title','Untitled')
         filename = safe_filename(title)
         filepath = CARDS_DIR / f"{filename}.md"
+        label = 'UPDATED' if prev is not None else 'CREATED'
+        owner = owners.get(filename)
+        if owner is not None and owner != key:
+            # 제목이 같은 다른 아이템의 카드 — 덮어쓰면 그 카드의 메모가 사라진다
+            print(f"  ⚠️ [SKIP] {filename}.md: 다른 Zotero 아이템({owner})의 카드와 파일명이 같아 건너뜁니다")
+            continue
+        if prev and owners.get(prev) == key:
+            del owners[prev]
+        owners[filename] = key
         
         if not write_mode:
             e = "🟢" if rel>=50 else "🟡" if rel>=20 else "⚪"
-            print(f"  {e} [DRY-RUN] {filename}.md ({rel})")
+            print(f"  {e} [DRY-RUN {label}] {filename}.md ({rel})")
             created.append(filename); continue
         
-        ai_data = None
-        if ai_mode:
-            text = item.get('abstract', '')
-            if text:
-                ai_data = ai_analyze(text, rp)
-                time.sleep(1)
-        
-        filepath.write_text(make_card(item, ai_data), encoding='utf-8')
+        pdf_path, fulltext = fulltexts.get(key, (None, ''))
+        old_path = CARDS_DIR / f"{prev}.md" if prev else None
+        old_card = old_path.read_text(encoding='utf-8') if old_path and old_path.exists() else None
+        fresh_ai = ai_data is not None
+        if old_card and not fresh_ai:
+            ai_data = recover_ai_data(old_card)
+        card = make_card(item, ai_data, profile, fulltext, pdf_path, relevance_score=rel, relevance_scorer=scorer)
+        if old_card:
+            card = carry_over_notes(old_card, card, keep_breakdown=not fresh_ai)
+        filepath.write_text(card, encoding='utf-8')
+        if old_path and old_path != filepath and old_path.exists():
+            old_path.unlink()
+        if use_pdf:
+            pdf_state.put(key, pdf_signature(item))
+        elif key in pdf_sigs:
+            # 원문 없이 다시 만든 카드 — 다음 --fulltext 실행에서 원문을 다시 넣는다
+            pdf_state.put(key, '')
+        state.put(key, h, filename)
         p = ai_data.get('reading_priority','to-read') if ai_data else 'to-read'
         e = {'must-read':'🔴','should-read':'🟡','reference-only':'⚪','to-read':'📘'}.get(p,'📘')
-        print(f"  {e} [CREATED] {filename}.md ({rel})")
+        print(f"  {e} [{label}] {filename}.md ({rel})")
         created.append(filename)
+    state.close()
+    pdf_state.close()
+    print_llm_stats()
     
     print(f"\n{'='*50}")
     print(f"  {'실제 생성' if write_mode else 'DRY-RUN'}: {len(created)}개")
     if not write_mode: print(f"\n💡 python3 sync_and_analyze.py --write")
     elif created: print(f"💡 python3 generate_index.py")
+    return created
 
 if __name__ == '__main__':
     main()
@@ -2,57 +2,225 @@
 ResearchOS → thesis-coach 자동 연동 스크립트
 - library.json에서 새 논문을 읽어 thesis-coach API로 전송
 - thesis-coach가 꺼져있으면 조용히 스킵
+- 새 논문은 keep-alive 연결 여러 개로 동시에 보낸다 (THESIS_COACH_CONCURRENCY, 기본 8).
+  서버가 배열 등록을 알리면 THESIS_COACH_BULK_SIZE편씩 묶어 보낸다.
+- 보낸 논문은 성공하는 즉시 logs/.state/thesis_coach.sqlite3에 (키, 보낸 내용 해시)로 기록한다.
+  중간에 죽어도 다음 실행은 남은 논문부터, 메타데이터가 바뀐 논문은 다시 보낸다.
 """
 
+import hashlib
 import json, os, sys
+import posixpath
+import threading
+from http.client import HTTPConnection, HTTPSConnection, RemoteDisconnected
+from itertools import islice
 from pathlib import Path
-from urllib.request import Request, urlopen
-from urllib.error import URLError
+from urllib.parse import urlsplit
+
+from llm_pool import completed_map
+from state_store import ItemStateStore, item_key
+from zotero_stream import LibraryStream
 
 # ── 설정 ────────────────────────────────────────────────────
 BASE_DIR = Path.home() / "ResearchOS"
 LIBRARY_JSON = BASE_DIR / "01_zotero_export" / "library.json"
-STATE_FILE = BASE_DIR / "logs" / ".state" / "thesis_coach_synced.json"
+STATE_DB = BASE_DIR / "logs" / ".state" / "thesis_coach.sqlite3"
+LEGACY_STATE_FILE = BASE_DIR / "logs" / ".state" / "thesis_coach_synced.json"
+LEGACY_HASH = "legacy"  # 예전 JSON 상태에서 옮겨온 키 (보낸 내용 해시를 모름)
 
 THESIS_COACH_URL = "http://localhost:3001/api"
 USER_ID = "00000000-0000-0000-0000-000000000001"  # demo user
 TIMEOUT = 3  # seconds
+CONCURRENCY = max(1, int(os.getenv("THESIS_COACH_CONCURRENCY", "8")))
+BULK_SIZE = max(1, int(os.getenv("THESIS_COACH_BULK_SIZE", "100")))
+# /health 응답 {"capabilities": [...]}에 이게 있으면 register-meta가 배열 본문을 받는다
+BULK_CAPABILITY = "register-meta-bulk"
+BULK_FALLBACK_STATUS = {400, 404, 405, 413}
 
 
-def load_synced_keys():
-    """이미 보낸 논문 키 목록 로드"""
-    if STATE_FILE.exists():
-        with open(STATE_FILE, "r") as f:
-            return set(json.load(f).get("synced_keys", []))
-    return set()
+def migrate_legacy_state(state):
+    """예전 thesis_coach_synced.json 키 목록을 SQLite 상태로 한 번 옮긴다"""
+    if not LEGACY_STATE_FILE.exists():
+        return 0
+    with open(LEGACY_STATE_FILE, "r") as f:
+        keys = json.load(f).get("synced_keys", [])
+    for key in keys:
+        if key and state.get(key) is None:
+            state.put(key, LEGACY_HASH, commit=False)
+    state.commit()
+    LEGACY_STATE_FILE.rename(LEGACY_STATE_FILE.with_suffix(".json.migrated"))
+    return len(keys)
 
 
-def save_synced_keys(keys):
-    """보낸 논문 키 목록 저장"""
-    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(STATE_FILE, "w") as f:
-        json.dump({"synced_keys": sorted(keys)}, f, indent=2)
+def payload_hash(payload):
+    """보낸 내용 해시. 필드 순서는 paper_payload가 고정하므로 json.dumps 없이 이어 붙인다
+    (초록이 길어 아이템마다 JSON 인코딩하면 변경 없는 실행의 대부분을 차지한다)."""
+    raw = "\x1f".join(f"{k}={v}" for k, v in payload.items())
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
 
-def health_check():
-    """thesis-coach가 살아있는지 확인"""
-    try:
-        req = Request(f"{THESIS_COACH_URL}/../health")
-        urlopen(req, timeout=TIMEOUT)
-        return True
-    except Exception:
-        # /health가 없으면 papers 목록으로 확인
+def pending_items(items, state, chunk_size=500):
+    """보낸 적 없거나 보낸 뒤 메타데이터가 바뀐 아이템만 yield.
+
+    전체 상태를 메모리에 올리지 않고 chunk_size개씩 키 색인으로 조회한다.
+    """
+    for chunk in chunked(items, chunk_size):
+        keyed = [(item_key(item), item) for item in chunk]
+        known = state.get_many(key for key, _ in keyed if key)
+        for key, item in keyed:
+            if not key:
+                continue
+            prev = known.get(key)
+            if prev is None:
+                yield item
+                continue
+            h = payload_hash(paper_payload(item))
+            if prev[0] == h:
+                continue
+            if prev[0] == LEGACY_HASH:
+                # 예전 상태로 이미 보낸 논문 — 다시 보내지 않고 지금 내용을 기준으로 삼는다
+                state.put(key, h, prev[1], commit=False)
+                continue
+            yield item
+
+
+class CoachError(Exception):
+    """thesis-coach가 4xx/5xx로 응답함"""
+
+    def __init__(self, status, body=b""):
+        super().__init__(f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}")
+        self.status = status
+
+
+class CoachClient:
+    """thesis-coach API 클라이언트.
+
+    스레드마다 keep-alive HTTP 연결 하나를 만들어 계속 쓴다 (요청마다 새 TCP 연결을
+    열던 urlopen 대신). 서버가 /health 응답의 capabilities에 BULK_CAPABILITY를 알리면
+    register-meta에 논문 배열을 한 번에 보낸다.
+    """
+
+    def __init__(self, base_url=THESIS_COACH_URL, timeout=TIMEOUT):
+        parts = urlsplit(base_url)
+        self.conn_class = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.bulk = False
+        self._local = threading.local()
+        self._conns = []
+        self._lock = threading.Lock()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self.conn_class(self.netloc, timeout=self.timeout)
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def request(self, method, path, payload=None):
+        """JSON 요청 → 응답 JSON (2xx 본문이 JSON이 아니면 ValueError).
+
+        서버가 쉬던 keep-alive 연결을 닫아 둔 경우(보내기가 끊기거나, 응답 없이 닫힘)에만 새로
+        연결해 한 번 다시 보낸다. 그 밖의 연결 오류는 서버가 이미 처리했을 수 있으므로
+        (다시 보내면 중복 등록) 그대로 올린다.
+        """
+        headers = {"x-user-id": USER_ID}
+        body = None
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        for attempt in (0, 1):
+            conn = self._conn()
+            stale_ok = conn.sock is not None and not attempt  # 재사용하는 연결의 첫 시도만
+            try:
+                conn.request(method, path, body=body, headers=headers)
+            except (BrokenPipeError, ConnectionResetError):
+                # 요청을 다 보내기 전에 끊김 → 서버는 이 요청을 처리하지 못했다
+                conn.close()
+                if stale_ok:
+                    continue
+                raise
+            try:
+                resp = conn.getresponse()
+                data = resp.read()
+                break
+            except RemoteDisconnected:
+                # 응답 첫 바이트 전에 닫힘: 쉬던 연결을 서버가 정리한 경우
+                conn.close()
+                if stale_ok:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+        if resp.status >= 400:
+            raise CoachError(resp.status, data)
+        return json.loads(data) if data else None
+
+    def health(self):
+        """thesis-coach가 살아있는지 확인 (+ 배열 등록 지원 여부)"""
         try:
-            req = Request(f"{THESIS_COACH_URL}/papers")
-            req.add_header("x-user-id", USER_ID)
-            urlopen(req, timeout=TIMEOUT)
+            info = self.request("GET", posixpath.normpath(self.prefix + "/../health"))
+        except ValueError:
+            # 2xx인데 JSON이 아닌 본문("ok" 등) → 살아있지만 배열 등록은 모른다
             return True
         except Exception:
-            return False
+            # /health가 없으면 papers 목록으로 확인
+            try:
+                self.request("GET", f"{self.prefix}/papers")
+                return True
+            except Exception:
+                return False
+        if isinstance(info, dict):
+            self.bulk = BULK_CAPABILITY in (info.get("capabilities") or ())
+        return True
+
+    def register(self, item):
+        """논문 1개를 thesis-coach에 등록"""
+        return self.request("POST", f"{self.prefix}/papers/register-meta", paper_payload(item))
+
+    def register_many(self, items):
+        """논문 여러 개를 배열 하나로 등록 → 입력 순서대로 결과 목록"""
+        result = self.request("POST", f"{self.prefix}/papers/register-meta", [paper_payload(i) for i in items])
+        if isinstance(result, dict):
+            result = result.get("results")
+        if not isinstance(result, list) or len(result) != len(items):
+            raise CoachError(502, b"bulk register-meta: unexpected response")
+        return result
+
+    def send(self, items):
+        """items 등록 → [(item, 결과 dict 또는 None, 에러 또는 None)]
+
+        배열 등록이 거절되면(404/405/413/400) 이후로는 한 편씩 보낸다 (main이 묶음 크기도 1로 줄인다).
+        """
+        if self.bulk and len(items) > 1:
+            try:
+                return [(item, result, None) for item, result in zip(items, self.register_many(items))]
+            except CoachError as e:
+                if e.status not in BULK_FALLBACK_STATUS:
+                    return [(item, None, e) for item in items]
+                self.bulk = False
+            except Exception as e:
+                return [(item, None, e) for item in items]
+        out = []
+        for item in items:
+            try:
+                out.append((item, self.register(item), None))
+            except Exception as e:
+                out.append((item, None, e))
+        return out
 
+    def close(self):
+        with self._lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns.clear()
 
-def register_paper(item):
-    """논문 1개를 thesis-coach에 등록"""
+
+def paper_payload(item):
+    """CSL-JSON 아이템 → register-meta 요청 본문"""
     # 저자 추출
     authors = ""
     if "author" in item:
@@ -70,7 +238,7 @@ def register_paper(item):
         if parts and parts[0]:
             year = parts[0][0]
 
-    payload = {
+    return {
         "title": item.get("title", "Untitled"),
         "authors": authors,
         "year": year,
@@ -80,58 +248,66 @@ def register_paper(item):
         "zotero_key": item.get("id", ""),
     }
 
-    data = json.dumps(payload).encode("utf-8")
-    req = Request(
-        f"{THESIS_COACH_URL}/papers/register-meta",
-        data=data,
-        method="POST",
-    )
-    req.add_header("Content-Type", "application/json")
-    req.add_header("x-user-id", USER_ID)
 
-    resp = urlopen(req, timeout=TIMEOUT)
-    return json.loads(resp.read().decode("utf-8"))
+def chunked(items, size):
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
 
 
-def main():
+def main(concurrency=None):
     # 1) thesis-coach 살아있는지 확인
-    if not health_check():
+    client = CoachClient()
+    if not client.health():
         print("⏭️  thesis-coach 미실행 → 스킵")
         return
 
-    # 2) library.json 읽기
+    # 2) library.json 확인
     if not LIBRARY_JSON.exists():
         print(f"❌ {LIBRARY_JSON} 없음")
         return
 
-    with open(LIBRARY_JSON, "r", encoding="utf-8") as f:
-        items = json.load(f)
+    # 3) 이미 보낸 논문은 건너뛰고, 새/바뀐 논문은 읽는 대로 동시에 전송 (출력은 끝난 순서)
+    state = ItemStateStore(STATE_DB, table="papers")
+    migrated = migrate_legacy_state(state)
+    if migrated:
+        print(f"📦 예전 동기화 기록 {migrated}편을 {STATE_DB.name}로 옮겼습니다")
+    items = LibraryStream(LIBRARY_JSON)
+    pending = pending_items(items, state)
+
+    def chunks():
+        # 묶음 크기는 만들 때마다 본다 — 배열 등록이 거절되면(client.bulk=False) 그 뒤로는
+        # 한 편씩 만들어 여러 워커가 나눠 보낸다
+        while chunk := list(islice(pending, BULK_SIZE if client.bulk else 1)):
+            yield chunk
 
-    # 3) 이미 보낸 논문 확인
-    synced = load_synced_keys()
-    new_items = [item for item in items if item.get("id", "") not in synced]
+    success = 0
+    attempted = 0
+    try:
+        for sent in completed_map(client.send, chunks(), workers=concurrency or CONCURRENCY):
+            for item, result, error in sent:
+                attempted += 1
+                title = item.get("title", "Untitled")
+                if error is not None:
+                    print(f"  ❌ {title[:50]}: {error}")
+                    continue
+                status = result.get("status", "unknown") if isinstance(result, dict) else "unknown"
+                state.put(item_key(item), payload_hash(paper_payload(item)), status, commit=False)
+                success += 1
+                print(f"  ✅ [{status}] {title[:50]}")
+            # 응답 받은 묶음마다 (메인 스레드에서) 바로 커밋 — 앞 묶음이 느려도 끝난 논문은 기록되어
+            # 중간에 죽어도 다시 안 보낸다
+            state.commit()
+    finally:
+        client.close()
+        state.commit()
+        state.close()
 
-    if not new_items:
-        print(f"📋 thesis-coach: 새 논문 없음 (전체 {len(items)}편 동기화 완료)")
+    if not attempted:
+        print(f"📋 thesis-coach: 새 논문 없음 (전체 {items.count}편 동기화 완료)")
         return
 
-    # 4) 새 논문 전송
-    success = 0
-    for item in new_items:
-        key = item.get("id", "")
-        title = item.get("title", "Untitled")
-        try:
-            result = register_paper(item)
-            status = result.get("status", "unknown")
-            synced.add(key)
-            success += 1
-            print(f"  ✅ [{status}] {title[:50]}")
-        except Exception as e:
-            print(f"  ❌ {title[:50]}: {e}")
-
-    # 5) 상태 저장
-    save_synced_keys(synced)
-    print(f"🔗 thesis-coach: {success}/{len(new_items)}편 연동 완료")
+    print(f"🔗 thesis-coach: {success}/{attempted}편 연동 완료")
 
 
 if __name__ == "__main__":
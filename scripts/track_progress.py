@@ -3,10 +3,13 @@
 축별 논문 수집 진행도 추적
 """
 
+import argparse
 import json
 from pathlib import Path
 from collections import defaultdict
 
+from card_model import map_cards, read_card_meta
+
 CARDS_DIR = Path.home() / "ResearchOS" / "02_cards_basic"
 
 # 목표 설정
@@ -37,31 +40,6 @@ GOALS = {
     }
 }
 
-def parse_frontmatter(filepath):
-    """카드에서 태그 추출"""
-    content = filepath.read_text(encoding='utf-8')
-    if not content.startswith('---'):
-        return []
-    
-    parts = content.split('---', 2)
-    if len(parts) < 3:
-        return []
-    
-    tags = []
-    in_tags = False
-    for line in parts[1].split('\n'):
-        line = line.strip()
-        if line == 'tags:':
-            in_tags = True
-            continue
-        if in_tags:
-            if line.startswith('- '):
-                tag = line[2:].strip().strip('"')
-                tags.append(tag)
-            elif not line.startswith('-'):
-                break
-    return tags
-
 def categorize_paper(tags):
     """논문을 축별로 분류"""
     axes = []
@@ -95,13 +73,18 @@ def get_paper_type(tags):
     return "other"
 
 def main():
+    parser = argparse.ArgumentParser(description="축별 논문 수집 진행도")
+    parser.add_argument("--jobs", type=int, default=None, help="카드 로딩 프로세스 수 (기본: 카드가 많을 때만 CPU 코어 수)")
+    args = parser.parse_args()
+
     papers = list(CARDS_DIR.glob("*.md"))
+    metas = map_cards(read_card_meta, papers, jobs=args.jobs)
     
     # 축별 카운트
     axis_counts = defaultdict(lambda: {"total": 0, "by_type": defaultdict(int), "papers": []})
     
-    for paper in papers:
-        tags = parse_frontmatter(paper)
+    for paper, meta in zip(papers, metas):
+        tags = meta.tags
         axes = categorize_paper(tags)
         paper_type = get_paper_type(tags)
         
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""ResearchOS 상주 동기화 데몬 (run_sync.sh 대체).
+
+Zotero export(My Library.json / library.json)와 카드 폴더를 감시하다가, 변경이
+잠잠해지면(debounce) 한 프로세스 안에서
+  sync_and_analyze → generate_index (+ 검색 색인) → sync_to_thesis_coach
+를 차례로 실행한다. 모듈, LLM SDK 클라이언트, 연구 프로필, 인덱스 엔진이
+메모리에 남아 있으므로 실행할 때마다 인터프리터 세 개를 새로 띄우고 상태를
+다시 읽을 필요가 없다. 카드만 바뀌었으면 (Obsidian에서 우선순위 수정 등)
+그 카드들만 인덱스에 반영한다.
+
+감시: watchdog(inotify/FSEvents)이 설치돼 있으면 쓰고, 없으면 (mtime, 크기) 폴링.
+변경 판단: library.json을 blake2b로 스트리밍 해시해 마지막 실행과 비교한다.
+매 실행마다 "변경 → 인덱스 갱신" 지연 시간을 로그에 남긴다.
+
+사용법:
+  python3 watch_sync.py                          # 상주 (Ctrl+C로 종료)
+  python3 watch_sync.py --once                   # 한 번만 확인/실행 (cron, launchd용)
+  python3 watch_sync.py --debounce 2 --poll 1 --no-watchdog
+  python3 watch_sync.py --sync-args "--write --ai"
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import os
+import shlex
+import signal
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+
+import generate_index
+import sync_and_analyze
+import sync_to_thesis_coach
+from index_engine import IndexEngine
+from search import CardSearchIndex
+
+BASE_DIR = Path.home() / "ResearchOS"
+EXPORT_DIR = BASE_DIR / "01_zotero_export"
+EXPORT_FILE = EXPORT_DIR / "My Library.json"
+LIBRARY = EXPORT_DIR / "library.json"
+CARDS_DIR = BASE_DIR / "02_cards_basic"
+LOG_DIR = BASE_DIR / "logs"
+STATE_DIR = LOG_DIR / ".state"
+LAST_RUN_FILE = STATE_DIR / "last_run"
+LAST_HASH_FILE = STATE_DIR / "last_hash"
+
+HASH_CHUNK = 1 << 20
+
+
+def log_file() -> Path:
+    return LOG_DIR / f"sync_{datetime.now():%Y%m%d}.log"
+
+
+def log(message: str) -> None:
+    line = f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message}"
+    print(line, flush=True)
+    with open(log_file(), "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+def file_hash(path: Path) -> str:
+    """스트리밍 blake2b (파일 전체를 메모리에 올리지 않는다)"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_sig(path: Path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def run_step(name: str, fn):
+    """한 단계를 실행하고 출력은 로그 파일로 보낸다. 실패해도 다음 단계는 계속."""
+    start = time.perf_counter()
+    try:
+        with open(log_file(), "a", encoding="utf-8") as f, contextlib.redirect_stdout(f):
+            result = fn()
+    except SystemExit as exc:
+        log(f"FAIL: {name} 종료코드={exc.code}")
+    except Exception as exc:
+        log(f"FAIL: {name} — {exc!r}")
+    else:
+        log(f"SUCCESS: {name} 완료 ({time.perf_counter() - start:.2f}s)")
+        return result
+    return None
+
+
+class Pipeline:
+    """메모리에 상주하는 sync → index → thesis-coach 파이프라인."""
+
+    def __init__(self, sync_args: list[str]):
+        self.sync_args = sync_args
+        self.engine = IndexEngine.load(generate_index.ENGINE_STATE)
+        self.search_index = CardSearchIndex()
+        self.export_sig = None
+        self.library_sig = None
+        self.library_hash = LAST_HASH_FILE.read_text().strip() if LAST_HASH_FILE.exists() else None
+
+    def library_changed(self) -> bool:
+        """My Library.json → library.json 복사 후, 해시가 마지막 실행과 다른지"""
+        sig = file_sig(EXPORT_FILE)
+        if sig is not None and sig != self.export_sig:
+            tmp = LIBRARY.with_name(f".{LIBRARY.name}.tmp")
+            tmp.write_bytes(EXPORT_FILE.read_bytes())
+            os.replace(tmp, LIBRARY)  # 읽는 쪽이 반쯤 복사된 파일을 보지 않게
+            self.export_sig = sig
+            log("COPY: My Library.json → library.json")
+
+        sig = file_sig(LIBRARY)
+        if sig is None:
+            log("ERROR: library.json 파일 없음")
+            return False
+        if sig == self.library_sig:
+            return False
+        self.library_sig = sig
+        digest = file_hash(LIBRARY)
+        if digest == self.library_hash:
+            log(f"SKIP: 변경없음 — 해시 동일 ({digest})")
+            return False
+        self.library_hash = digest
+        return True
+
+    def run(self, library: bool, cards: set[str] | None, changed_at: float | None = None) -> None:
+        start = time.time()
+        synced = library and self.library_changed()
+        if synced:
+            log(f"START: 라이브러리 변경 감지 (hash: {self.library_hash})")
+            run_step("sync_and_analyze", lambda: sync_and_analyze.main(self.sync_args))
+            names = None  # 카드가 새로 생기거나 이름이 바뀌었을 수 있으니 폴더 전체 확인
+        elif cards and self.engine.refresh(CARDS_DIR, names=sorted(cards)):
+            # sync가 방금 쓴 카드처럼 엔진이 이미 아는 상태면 여기서 조용히 끝난다
+            log(f"START: 카드 {len(cards)}개 변경")
+            names = ()  # 엔진에 이미 반영했으니 출력만 다시 낸다
+        else:
+            if library:
+                LAST_RUN_FILE.write_text(f"{int(time.time())}\n")
+            return
+
+        run_step("generate_index", lambda: generate_index.update_indexes(
+            names=names, engine=self.engine, save=synced))
+        index_done = time.time()
+        run_step("search_index", lambda: self.search_index.refresh(
+            CARDS_DIR, names=None if names is None else sorted(cards)))
+
+        if synced:
+            run_step("sync_to_thesis_coach", sync_to_thesis_coach.main)
+            STATE_DIR.mkdir(parents=True, exist_ok=True)
+            LAST_HASH_FILE.write_text(self.library_hash + "\n")
+
+        LAST_RUN_FILE.write_text(f"{int(time.time())}\n")
+        origin = changed_at if changed_at is not None else start
+        log(f"DONE: 변경 → 인덱스 갱신 {index_done - origin:.2f}s (처리 {index_done - start:.2f}s)")
+
+    def close(self) -> None:
+        self.engine.save(generate_index.ENGINE_STATE)
+        self.search_index.close()
+
+
+class PendingChanges:
+    """감시 스레드가 모은 변경 + debounce 대기"""
+
+    def __init__(self):
+        self.cond = threading.Condition()  # RLock이라 시그널 핸들러(메인 스레드)에서 stop()해도 안전
+        self.stopped = False
+        self.library = False
+        self.cards: set[str] = set()
+        self.first = None  # 첫 변경 시각 (time.time)
+        self.last = 0.0    # 마지막 변경 시각 (time.monotonic)
+
+    def add(self, path: str) -> None:
+        p = Path(path)
+        with self.cond:
+            if p.parent == EXPORT_DIR and p.name in (EXPORT_FILE.name, LIBRARY.name):
+                self.library = True
+            elif p.parent == CARDS_DIR and p.suffix == ".md" and not p.name.startswith("."):
+                self.cards.add(p.name)
+            else:
+                return
+            if self.first is None:
+                self.first = time.time()
+            self.last = time.monotonic()
+            self.cond.notify()
+
+    def stop(self) -> None:
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+
+    def wait(self, debounce: float):
+        """변경이 생기고 debounce초 동안 조용해질 때까지 기다렸다가 꺼낸다. stop() 후에는 None."""
+        with self.cond:
+            while True:
+                if self.stopped:
+                    return None
+                if self.first is None:
+                    self.cond.wait()
+                    continue
+                quiet = time.monotonic() - self.last
+                if quiet >= debounce:
+                    taken = (self.library, self.cards, self.first)
+                    self.library, self.cards, self.first = False, set(), None
+                    return taken
+                self.cond.wait(debounce - quiet)
+
+
+if HAS_WATCHDOG:
+    class _Handler(FileSystemEventHandler):
+        def __init__(self, pending: PendingChanges):
+            self.pending = pending
+
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            self.pending.add(event.src_path)
+            dest = getattr(event, "dest_path", "")
+            if dest:
+                self.pending.add(dest)
+
+
+def poll_loop(pending: PendingChanges, interval: float) -> None:
+    """watchdog이 없을 때: library/export는 (mtime, 크기), 카드 폴더는 scandir 스냅샷 비교."""
+    def snapshot():
+        sigs = {}
+        for path in (EXPORT_FILE, LIBRARY):
+            sigs[str(path)] = file_sig(path)
+        with os.scandir(CARDS_DIR) as it:
+            for e in it:
+                if e.name.endswith(".md") and e.is_file():
+                    st = e.stat()
+                    sigs[e.path] = (st.st_mtime_ns, st.st_size)
+        return sigs
+
+    before = snapshot()
+    while True:
+        time.sleep(interval)
+        now = snapshot()
+        for path in before.keys() | now.keys():
+            if before.get(path) != now.get(path):
+                pending.add(path)
+        before = now
+
+
+def watch(pipeline: Pipeline, pending: PendingChanges, debounce: float, poll: float,
+          use_watchdog: bool) -> None:
+    if use_watchdog and HAS_WATCHDOG:
+        observer = Observer()
+        handler = _Handler(pending)
+        observer.schedule(handler, str(EXPORT_DIR), recursive=False)
+        observer.schedule(handler, str(CARDS_DIR), recursive=False)
+        observer.daemon = True
+        observer.start()
+        log(f"WATCH: watchdog ({type(observer).__name__}) | debounce {debounce}s")
+    else:
+        threading.Thread(target=poll_loop, args=(pending, poll), daemon=True).start()
+        log(f"WATCH: 폴링 {poll}s 간격 | debounce {debounce}s"
+            + ("" if HAS_WATCHDOG else " (pip install watchdog 하면 이벤트 방식)"))
+
+    pipeline.run(library=True, cards=None)  # 꺼져 있던 동안의 변경 반영
+    # 종료 신호는 실행 사이에서만 확인한다 — 카드/인덱스/상태 DB를 쓰다 만 채로 끝나지 않게
+    while (taken := pending.wait(debounce)) is not None:
+        library, cards, first = taken
+        pipeline.run(library, cards, changed_at=first)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ResearchOS 상주 동기화 (sync → index → thesis-coach)")
+    parser.add_argument("--once", action="store_true", help="한 번만 확인/실행하고 종료 (run_sync.sh, launchd용)")
+    parser.add_argument("--debounce", type=float, default=3.0, help="마지막 변경 후 기다릴 초 (기본 3)")
+    parser.add_argument("--min-interval", type=float, default=30.0,
+                        help="--once: 마지막 실행 후 이 초 안에는 건너뜀 (기본 30)")
+    parser.add_argument("--poll", type=float, default=2.0, help="폴링 간격 초 (watchdog 미사용 시, 기본 2)")
+    parser.add_argument("--no-watchdog", action="store_true", help="watchdog이 있어도 폴링 사용")
+    parser.add_argument("--sync-args", default="--write", help='sync_and_analyze 인자 (기본 "--write")')
+    args = parser.parse_args()
+
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    CARDS_DIR.mkdir(parents=True, exist_ok=True)
+
+    if args.once and LAST_RUN_FILE.exists():
+        elapsed = time.time() - int(LAST_RUN_FILE.read_text().strip() or 0)
+        if elapsed < args.min_interval:
+            log(f"SKIP: debounce — 마지막 실행 {elapsed:.0f}초 전 (< {args.min_interval:.0f}초)")
+            return
+
+    pipeline = Pipeline(shlex.split(args.sync_args))
+    pending = PendingChanges()
+
+    def stop(signum, frame):
+        # launchd/systemd의 SIGTERM과 첫 Ctrl+C: 지금 실행을 마치고 종료. 두 번째 Ctrl+C는 바로 중단.
+        if pending.stopped and signum == signal.SIGINT:
+            raise KeyboardInterrupt
+        log("STOP: 현재 실행을 마치고 종료합니다 (바로 끝내려면 Ctrl+C 한 번 더)")
+        pending.stop()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        if args.once:
+            pipeline.run(library=True, cards=None)
+        else:
+            watch(pipeline, pending, args.debounce, args.poll, not args.no_watchdog)
+        log("STOP: 종료")
+    except KeyboardInterrupt:
+        log("STOP: 중단")
+    finally:
+        pipeline.close()
+
+
+if __name__ == "__main__":
+    main()
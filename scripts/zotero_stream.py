@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Zotero CSL-JSON export 스트리밍 파서.
+
+library.json 전체를 ``json.load`` 하지 않고, 최상위 배열 ``[...]`` 또는
+``{"items": [...]}`` 안의 아이템을 하나씩 꺼낸다. 메모리에는 청크 하나와
+현재 아이템 하나만 올라간다.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from pathlib import Path
+
+CHUNK_SIZE = 1 << 16
+
+_WS = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*")
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """바이트 파일 위의 작은 JSON 토큰 리더 (버퍼는 현재 값 하나 크기로 유지)."""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, min_size: int = 0) -> None:
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        data = self.f.read(max(self.chunk_size, min_size))
+        if not data:
+            self.eof = True
+            self.buf += self.decoder.decode(b"", final=True)
+            return
+        self.buf += self.decoder.decode(data)
+
+    def error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self.buf, self.pos)
+
+    def peek(self) -> str:
+        """공백을 건너뛴 다음 글자 ('' 이면 파일 끝)."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos:self.pos + 1]
+            self.fill()
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise self.error(f"Expecting {ch!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+                # 버퍼 끝에 걸친 숫자는 잘렸을 수 있으니 더 읽어서 확인
+                if self.eof or not (
+                    isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                    and _NUMBER_TAIL.fullmatch(self.buf, end)
+                ):
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # 읽는 양을 버퍼 크기만큼 늘려 큰 아이템도 재시도가 선형으로 끝나게 한다.
+            self.fill(len(self.buf) - self.pos)
+
+    def iter_array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            ch = self.peek()
+            self.pos += 1
+            if ch == "]":
+                return
+            if ch != ",":
+                self.pos -= 1
+                raise self.error("Expecting ',' delimiter")
+
+
+def iter_library_items(path: Path, chunk_size: int = CHUNK_SIZE):
+    """library.json의 아이템을 하나씩 yield (최상위 배열 또는 {"items": [...]})."""
+    with open(path, "rb") as f:
+        reader = _Reader(f, chunk_size)
+        ch = reader.peek()
+        if ch == "[":
+            yield from reader.iter_array()
+            return
+        if ch != "{":
+            raise reader.error("Expecting '[' or '{'")
+        reader.pos += 1
+        while reader.peek() != "}":
+            key = reader.value()
+            reader.expect(":")
+            if key == "items" and reader.peek() == "[":
+                yield from reader.iter_array()
+            else:
+                reader.value()
+            if reader.peek() == ",":
+                reader.pos += 1
+
+
+class LibraryStream:
+    """iter_library_items를 감싸 순회한 아이템 수를 세어 둔다."""
+
+    def __init__(self, path: Path, chunk_size: int = CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.count = 0
+
+    def __iter__(self):
+        self.count = 0
+        for item in iter_library_items(self.path, self.chunk_size):
+            self.count += 1
+            yield item